@@ -0,0 +1,287 @@
+"""
+Streaming analysis of the logger's JSONL output.
+
+Records are read lazily one line at a time, so memory stays constant no
+matter how large game_events.jsonl or game_state.jsonl grow.
+
+    python analyze.py rates game_events.jsonl
+    python analyze.py timeline game_state.jsonl
+    python analyze.py gaps game_state.jsonl --fps 60
+    python analyze.py summary sessions/*.jsonl --jobs 4
+
+`rates`, `timeline` and `gaps` print one JSON object per line as they go;
+`summary` reduces whole files and can process several in parallel.
+"""
+import argparse
+import bz2
+import gzip
+import itertools
+import json
+import lzma
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+TIMESTAMP_FORMAT = "%H:%M:%S.%f"
+STATE_META_KEYS = {"timestamp", "elapsed_s", "frame", "screen_size"}
+
+
+_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+try:
+    from compression import zstd  # Python 3.14+
+    _OPENERS[".zst"] = zstd.open
+except ImportError:
+    pass
+
+
+def open_log(path):
+    """Open a log file (or a compressed rotated segment) for text reading."""
+    if path == "-":
+        return sys.stdin
+    for extension, opener in _OPENERS.items():
+        if path.endswith(extension):
+            return opener(path, "rt")
+    return open(path)
+
+
+def read_records(path, where=None):
+    """
+    Yield parsed records from a JSONL file, skipping blank or torn lines.
+    `where` is an optional jq expression; records it maps to false are dropped.
+    """
+    program = None
+    if where:
+        import jq  # optional: only needed for --where
+        program = jq.compile(where)
+
+    with open_log(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written last line of a live session
+            if program is not None and not program.input_value(record).first():
+                continue
+            yield record
+
+
+def read_segments(paths, where=None):
+    """Chain several files (e.g. rotated segments, oldest first) into one stream."""
+    return itertools.chain.from_iterable(read_records(path, where) for path in paths)
+
+
+def parse_timestamp(text):
+    """Timestamps carry no date; callers handle midnight rollover."""
+    return datetime.strptime(text, TIMESTAMP_FORMAT)
+
+
+def with_wall_clock(records):
+    """
+    Yield (seconds_since_first_record, record) pairs from the time-of-day
+    `timestamp` field, adding a day whenever the clock wraps past midnight.
+    """
+    first = None
+    offset = timedelta()
+    previous = None
+    for record in records:
+        stamp = parse_timestamp(record["timestamp"])
+        if previous is not None and stamp < previous:
+            offset += timedelta(days=1)
+        previous = stamp
+        stamp += offset
+        if first is None:
+            first = stamp
+        yield (stamp - first).total_seconds(), record
+
+
+def event_rates(records):
+    """
+    Per-second event counts, one row per elapsed second with events.
+    Relies on `elapsed_s` being non-decreasing, so only one second of
+    counts is held at a time.
+    """
+    current = None
+    counts = Counter()
+    for record in records:
+        second = record.get("elapsed_s", 0)
+        if current is not None and second != current:
+            yield {"elapsed_s": current, "total": sum(counts.values()), "by_type": dict(counts)}
+            counts = Counter()
+        current = second
+        counts[record.get("type", "?")] += 1
+    if current is not None:
+        yield {"elapsed_s": current, "total": sum(counts.values()), "by_type": dict(counts)}
+
+
+def group_counts(record):
+    """Sprite-group sizes in one state snapshot, from their `count` fields."""
+    return {
+        key: value["count"]
+        for key, value in record.items()
+        if key not in STATE_META_KEYS and isinstance(value, dict) and "count" in value
+    }
+
+
+def entity_timeline(records):
+    """Entity counts per snapshot."""
+    for record in records:
+        yield {
+            "frame": record.get("frame"),
+            "elapsed_s": record.get("elapsed_s"),
+            "counts": group_counts(record),
+        }
+
+
+def frame_gaps(records, fps=60, tolerance=1.5):
+    """
+    Flag stretches where wall time between records exceeds what their
+    frame delta implies at `fps` (i.e. the game fell behind real time).
+    """
+    previous = None
+    for seconds, record in with_wall_clock(records):
+        frame = record.get("frame")
+        if previous is not None and frame is not None:
+            prev_seconds, prev_frame = previous
+            frames = frame - prev_frame
+            wall = seconds - prev_seconds
+            expected = frames / fps
+            if frames > 0 and wall > expected * tolerance:
+                yield {
+                    "from_frame": prev_frame,
+                    "to_frame": frame,
+                    "wall_s": round(wall, 3),
+                    "expected_s": round(expected, 3),
+                    "effective_fps": round(frames / wall, 2),
+                }
+            elif frames == 0 and wall > tolerance / fps:
+                # Same frame number, time still passing: the loop was stalled
+                yield {
+                    "from_frame": prev_frame,
+                    "to_frame": frame,
+                    "wall_s": round(wall, 3),
+                    "expected_s": 0.0,
+                    "effective_fps": 0.0,
+                }
+        if frame is not None:
+            previous = (seconds, frame)
+
+
+def summarize_file(path, fps=60, tolerance=1.5, where=None):
+    """Reduce one log file to a summary; detects events vs. state logs."""
+    records = read_records(path, where)
+    first = next(records, None)
+    if first is None:
+        return {"file": path, "kind": "empty", "records": 0}
+
+    def all_records():
+        yield first
+        yield from records
+
+    if "type" in first:
+        totals = Counter()
+        seconds = 0
+        peak = {"elapsed_s": None, "total": 0}
+        for row in event_rates(all_records()):
+            seconds += 1
+            totals.update(row["by_type"])
+            if row["total"] > peak["total"]:
+                peak = {"elapsed_s": row["elapsed_s"], "total": row["total"]}
+        return {
+            "file": path,
+            "kind": "events",
+            "records": sum(totals.values()),
+            "active_seconds": seconds,
+            "by_type": dict(totals.most_common()),
+            "peak_second": peak,
+        }
+
+    snapshots = 0
+    peaks = {}
+    gaps = 0
+    worst_gap = None
+
+    def counted():
+        nonlocal snapshots
+        for record in all_records():
+            snapshots += 1
+            for name, count in group_counts(record).items():
+                peaks[name] = max(peaks.get(name, 0), count)
+            yield record
+
+    for gap in frame_gaps(counted(), fps, tolerance):
+        gaps += 1
+        if worst_gap is None or gap["wall_s"] > worst_gap["wall_s"]:
+            worst_gap = gap
+
+    return {
+        "file": path,
+        "kind": "state",
+        "records": snapshots,
+        "peak_counts": peaks,
+        "gaps": gaps,
+        "worst_gap": worst_gap,
+    }
+
+
+def _summarize_args(args):
+    return summarize_file(*args)
+
+
+def summarize_files(paths, jobs=1, fps=60, tolerance=1.5, where=None):
+    """Summaries for several files, in input order, optionally in parallel."""
+    work = [(path, fps, tolerance, where) for path in paths]
+    if jobs <= 1 or len(paths) <= 1:
+        yield from map(_summarize_args, work)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(_summarize_args, work)
+
+
+def _write_rows(rows):
+    for row in rows:
+        sys.stdout.write(json.dumps(row) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rates = sub.add_parser("rates", help="per-second event counts")
+    timeline = sub.add_parser("timeline", help="entity counts per snapshot")
+    gaps = sub.add_parser("gaps", help="detect frames that fell behind real time")
+    for command in (rates, timeline, gaps):
+        command.add_argument("paths", nargs="+", help="one log, or its segments oldest first")
+
+    summary = sub.add_parser("summary", help="reduce whole files (events or state)")
+    summary.add_argument("paths", nargs="+")
+    summary.add_argument("--jobs", type=int, default=1, help="files processed in parallel")
+
+    for command in (rates, timeline, gaps, summary):
+        command.add_argument("--where", metavar="JQ",
+                             help="jq filter; records where it is false are skipped")
+    for command in (gaps, summary):
+        command.add_argument("--fps", type=float, default=60)
+        command.add_argument("--tolerance", type=float, default=1.5,
+                             help="flag gaps longer than expected x tolerance")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "rates":
+            _write_rows(event_rates(read_segments(args.paths, args.where)))
+        elif args.command == "timeline":
+            _write_rows(entity_timeline(read_segments(args.paths, args.where)))
+        elif args.command == "gaps":
+            _write_rows(frame_gaps(read_segments(args.paths, args.where), args.fps, args.tolerance))
+        else:
+            _write_rows(summarize_files(args.paths, args.jobs, args.fps, args.tolerance, args.where))
+    except BrokenPipeError:
+        pass  # e.g. piped into head
+
+
+if __name__ == "__main__":
+    main()
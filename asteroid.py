@@ -4,11 +4,18 @@ import math
 
 from circleshape import CircleShape
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, LINE_WIDTH, ASTEROID_MIN_RADIUS,
+    SCREEN_WIDTH, SCREEN_HEIGHT, LINE_WIDTH, ASTEROID_MIN_RADIUS, ASTEROID_HEALTH_PER_RADIUS,
+    LAYER_ASTEROIDS,
     ASTEROID_VERTEX_COUNT, ASTEROID_LUMP_VARIANCE,
     ASTEROID_ROTATION_SPEED_MIN, ASTEROID_ROTATION_SPEED_MAX,
 )
 from logger import log_event
+from spatial import SpatialGroup
+
+
+def asteroid_mass(radius):
+    """Area relative to the smallest asteroid."""
+    return (radius / ASTEROID_MIN_RADIUS) ** 2
 
 
 class Asteroid(CircleShape):
@@ -17,8 +24,11 @@ class Asteroid(CircleShape):
     Splits into smaller asteroids when destroyed.
     """
     
+    _layer = LAYER_ASTEROIDS
+    
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
+        self.health = radius * ASTEROID_HEALTH_PER_RADIUS  # splits once worn to zero
         self.rotation = 0
         self.rotation_speed = random.uniform(
             ASTEROID_ROTATION_SPEED_MIN, 
@@ -129,4 +139,20 @@ class Asteroid(CircleShape):
         create_split_asteroid(angle)
         create_split_asteroid(-angle)
         
-        return (pos_x, pos_y, radius)
\ No newline at end of file
+        return (pos_x, pos_y, radius)
+
+
+class AsteroidGroup(SpatialGroup):
+    """Spatially indexed asteroid group that keeps a running total mass."""
+    
+    def __init__(self, *sprites):
+        self.mass = 0.0
+        super().__init__(*sprites)
+    
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.mass += asteroid_mass(sprite.radius)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.mass -= asteroid_mass(sprite.radius)
@@ -1,6 +1,6 @@
 import pygame
 import random
-from asteroid import Asteroid
+from asteroid import Asteroid, asteroid_mass
 from constants import *
 
 
@@ -28,24 +28,83 @@ class AsteroidField(pygame.sprite.Sprite):
         ],
     ]
 
+    asteroids = None  # AsteroidGroup whose count and mass are budgeted; set by World
+
     def __init__(self):
         pygame.sprite.Sprite.__init__(self, self.containers)
         self.spawn_timer = 0.0
+        self.wave = 0
+        self.wave_time = 0.0
+        self.throttled = 0  # spawns skipped because a budget was full
 
     def spawn(self, radius, position, velocity):
         asteroid = Asteroid(position.x, position.y, radius)
         asteroid.velocity = velocity
 
+    def current_wave(self):
+        """Settings of the current wave, ramped up once past the last one."""
+        last = len(ASTEROID_WAVES) - 1
+        wave = dict(ASTEROID_WAVES[min(self.wave, last)])
+        if self.wave > last:
+            wave["spawn_rate"] *= 1 + ASTEROID_WAVE_RAMP * (self.wave - last)
+        return wave
+
+    def pressure(self):
+        """
+        Population metrics: count and mass against their budgets, and the
+        larger of the two ratios as `pressure` (1.0 means spawning stops).
+        """
+        count = len(self.asteroids) if self.asteroids is not None else 0
+        mass = self.asteroids.mass if self.asteroids is not None else 0.0
+        count_pressure = count / ASTEROID_MAX_COUNT
+        mass_pressure = mass / ASTEROID_MASS_BUDGET
+        return {
+            "count": count,
+            "mass": mass,
+            "count_pressure": round(count_pressure, 3),
+            "mass_pressure": round(mass_pressure, 3),
+            "pressure": round(max(count_pressure, mass_pressure), 3),
+            "wave": self.wave + 1,
+            "spawn_interval": round(self.spawn_interval(max(count_pressure, mass_pressure)), 3),
+            "throttled": self.throttled,
+        }
+
+    def spawn_interval(self, pressure):
+        """Seconds between spawns for this wave, stretched as pressure rises."""
+        interval = ASTEROID_SPAWN_RATE_SECONDS / self.current_wave()["spawn_rate"]
+        if pressure > ASTEROID_THROTTLE_PRESSURE:
+            # Linearly up to 4x slower at a full budget
+            excess = (pressure - ASTEROID_THROTTLE_PRESSURE) / (1 - ASTEROID_THROTTLE_PRESSURE)
+            interval *= 1 + 3 * min(1.0, excess)
+        return interval
+
     def update(self, dt):
+        # Advance the difficulty curve
+        self.wave_time += dt
+        if self.wave_time >= self.current_wave()["duration"]:
+            self.wave_time = 0.0
+            self.wave += 1
+
+        pressure = 0.0
+        mass = 0.0
+        if self.asteroids is not None:
+            mass = self.asteroids.mass
+            pressure = max(len(self.asteroids) / ASTEROID_MAX_COUNT, mass / ASTEROID_MASS_BUDGET)
+
         self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE_SECONDS:
+        if self.spawn_timer > self.spawn_interval(pressure):
             self.spawn_timer = 0
 
+            wave = self.current_wave()
+            kind = random.randint(1, min(wave["max_kind"], ASTEROID_KINDS))
+            if pressure >= 1 or mass + asteroid_mass(ASTEROID_MIN_RADIUS * kind) > ASTEROID_MASS_BUDGET:
+                self.throttled += 1  # budget full: skip this spawn
+                return
+
             # spawn a new asteroid at a random edge
             edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            speed = random.randint(*wave["speed"])
             velocity = edge[0] * speed
             velocity = velocity.rotate(random.randint(-30, 30))
             position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
+            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
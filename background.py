@@ -55,7 +55,7 @@ class Background:
     Layers further away move slower, creating depth illusion.
     """
     
-    def __init__(self):
+    def __init__(self, bake=True):
         self.stars = []
         self.time = 0
         self.last_player_pos = pygame.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
@@ -67,23 +67,31 @@ class Background:
                 y = random.uniform(0, SCREEN_HEIGHT)
                 self.stars.append(Star(x, y, layer))
         
-        # Create gradient background surface (dark blue to black)
+        # Create gradient background surface (dark blue to black); the
+        # nebula spots on it are the slow part, so they can wait for bake()
         self.gradient_surface = self._create_gradient()
+        self.nebulae = self._plan_nebulae()
+        if bake:
+            self.bake()
     
     def _create_gradient(self):
-        """Create a subtle space nebula gradient."""
-        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        
-        # Base: very dark with subtle blue tint
+        """Create a subtle space gradient."""
+        # Base: very dark with subtle blue tint. Every row is one color,
+        # so paint a single column and stretch it across
+        column = pygame.Surface((1, SCREEN_HEIGHT))
         for y in range(SCREEN_HEIGHT):
             # Gradient from dark purple-blue at top to pure black at bottom
             progress = y / SCREEN_HEIGHT
             r = int(5 * (1 - progress))
             g = int(5 * (1 - progress))
             b = int(15 * (1 - progress))
-            pygame.draw.line(surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+            column.set_at((0, y), (r, g, b))
         
-        # Add some nebula spots
+        return pygame.transform.scale(column, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    
+    def _plan_nebulae(self):
+        """Pick the nebula spots: (x, y, radius, color) each."""
+        nebulae = []
         for _ in range(5):
             x = random.randint(0, SCREEN_WIDTH)
             y = random.randint(0, SCREEN_HEIGHT)
@@ -92,14 +100,25 @@ class Background:
             # Choose nebula color
             colors = [(20, 10, 30), (10, 15, 25), (15, 5, 20)]
             color = random.choice(colors)
-            
-            # Draw soft nebula
-            for r in range(radius, 0, -10):
-                alpha = int(10 * (r / radius))
-                nebula_color = tuple(min(255, c + alpha) for c in color)
-                pygame.draw.circle(surface, nebula_color, (x, y), r)
-        
-        return surface
+            nebulae.append((x, y, radius, color))
+        return nebulae
+    
+    def bake(self):
+        """Paint the planned nebula spots onto the gradient (once)."""
+        while self.bake_step():
+            pass
+    
+    def bake_step(self):
+        """Paint the next planned nebula spot; False once none are left."""
+        if not self.nebulae:
+            return False
+        x, y, radius, color = self.nebulae.pop(0)
+        # Draw soft nebula
+        for r in range(radius, 0, -10):
+            alpha = int(10 * (r / radius))
+            nebula_color = tuple(min(255, c + alpha) for c in color)
+            pygame.draw.circle(self.gradient_surface, nebula_color, (x, y), r)
+        return True
     
     def update(self, dt, player_pos=None):
         """Update starfield with parallax based on player movement."""
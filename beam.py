@@ -0,0 +1,56 @@
+"""
+Continuous beam weapon.
+A beam is a single sprite re-aimed every frame it is held; World casts it
+as one ray against the asteroid index and shortens it to the first hit.
+"""
+import pygame
+from circleshape import CircleShape
+from constants import BEAM_LINGER, CULL_MARGIN, LAYER_SHOTS
+
+
+class Beam(CircleShape):
+    """
+    Ray from the ship's nose. `length` is the full range until World
+    clips it to whatever it hits; `damage` is applied per second.
+    """
+    
+    _layer = LAYER_SHOTS
+    
+    def __init__(self, origin, direction, length, color, damage, width):
+        super().__init__(origin.x, origin.y, 0)
+        self.direction = pygame.Vector2(direction)
+        self.range = length
+        self.length = length
+        self.color = color
+        self.damage = damage
+        self.width = width
+        self.linger = BEAM_LINGER
+    
+    def aim(self, origin, direction):
+        """Move the beam with the ship and keep it alive another frame."""
+        self.position.update(origin)
+        self.direction.update(direction)
+        self.length = self.range
+        self.linger = BEAM_LINGER
+    
+    def update(self, dt):
+        """Fade out once the weapon stops re-aiming it."""
+        self.linger -= dt
+        if self.linger <= 0:
+            self.kill()
+    
+    def draw_extent(self):
+        """The whole beam lies within its length of the ship's nose."""
+        return self.length + self.width + CULL_MARGIN
+    
+    def end(self):
+        """Far end of the beam, possibly past a screen edge (it does not wrap)."""
+        return self.position + self.direction * self.length
+    
+    def draw(self, surface):
+        """Draw as a glowing line."""
+        start = self.position
+        end = self.end()
+        glow = tuple(c // 3 for c in self.color)
+        pygame.draw.line(surface, glow, start, end, self.width + 4)
+        pygame.draw.line(surface, self.color, start, end, self.width)
@@ -4,12 +4,15 @@ Bomb system - droppable explosives with delayed detonation.
 import pygame
 import math
 from circleshape import CircleShape
+from stamps import stamps
 from constants import (
     BOMB_RADIUS,
     BOMB_FUSE_TIME,
     BOMB_EXPLOSION_RADIUS,
     BOMB_COLORS,
+    BOMB_FUSE_STEPS,
     LINE_WIDTH,
+    LAYER_ITEMS,
 )
 
 
@@ -19,6 +22,8 @@ class Bomb(CircleShape):
     Blinks faster as it nears detonation, then explodes.
     """
     
+    _layer = LAYER_ITEMS
+    
     def __init__(self, x, y, velocity):
         super().__init__(x, y, BOMB_RADIUS)
         self.velocity = velocity
@@ -53,18 +58,34 @@ class Bomb(CircleShape):
     
     def draw(self, surface):
         """Draw bomb with blinking effect."""
-        x, y = int(self.position.x), int(self.position.y)
+        surface.blit(*self.stamp())
+    
+    def stamp(self):
+        """One cached surface per blink color, fuse step and warning flash."""
+        color_index = int(self.blink_phase) % 2
+        fuse_left = max(0.0, min(1.0, self.fuse_timer / BOMB_FUSE_TIME))
+        fuse_step = min(BOMB_FUSE_STEPS - 1, int(fuse_left * BOMB_FUSE_STEPS))
+        flashing = self.fuse_timer < 0.5 and int(self.fuse_timer * 8) % 2 == 0
+        key = ("bomb", color_index, self.radius, fuse_step, flashing)
+        image = stamps.get(key, lambda: self._render_stamp(color_index, fuse_step, flashing))
+        half = image.get_width() // 2
+        return image, (int(self.position.x) - half, int(self.position.y) - half)
+    
+    def _render_stamp(self, color_index, fuse_step, flashing):
+        """Render body, fuse arc and flash onto a transparent surface."""
+        half = self.radius + 8
+        surface = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        x = y = half
         
         # Blink between two colors
-        color_index = int(self.blink_phase) % 2
         color = BOMB_COLORS[color_index]
         
         # Draw bomb body
         pygame.draw.circle(surface, color, (x, y), self.radius)
         pygame.draw.circle(surface, (255, 255, 255), (x, y), self.radius, LINE_WIDTH)
         
-        # Draw fuse indicator (arc that shrinks)
-        fuse_angle = (self.fuse_timer / BOMB_FUSE_TIME) * 360
+        # Draw fuse indicator (arc that shrinks), rounded up to its step
+        fuse_angle = (fuse_step + 1) / BOMB_FUSE_STEPS * 360
         if fuse_angle > 0:
             rect = pygame.Rect(x - self.radius - 4, y - self.radius - 4, 
                               (self.radius + 4) * 2, (self.radius + 4) * 2)
@@ -72,8 +93,10 @@ class Bomb(CircleShape):
                           math.radians(90), math.radians(90 + fuse_angle), 2)
         
         # Warning flash when about to explode
-        if self.fuse_timer < 0.5 and int(self.fuse_timer * 8) % 2 == 0:
+        if flashing:
             pygame.draw.circle(surface, (255, 255, 200), (x, y), self.radius + 5, 2)
+        
+        return surface
     
     def get_blast_radius(self):
         """Get the explosion radius for collision detection."""
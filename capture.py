@@ -0,0 +1,233 @@
+"""
+Full-fidelity binary state capture.
+
+Unlike log_state's sampled JSON, a capture stores every entity on every
+frame as fixed-width little-endian records:
+
+    header   magic, version, entity record size
+    frame    frame number (u32), sim time (f64), entity count (u32)
+             followed by `count` entity records:
+             kind (u8), pad, x, y, vx, vy, radius, rotation (f32 each)
+    index    u64 file offset of every frame, then a trailer pointing at it
+
+The reader memory-maps the file, so jumping to any frame is a slice of
+the mapping rather than a parse of everything before it. Captures left
+without an index (e.g. after a crash) are re-indexed by scanning headers.
+
+    python capture.py info game_state.cap
+    python capture.py dump game_state.cap --frame 600
+"""
+import argparse
+import json
+import mmap
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only needed for array views
+    np = None
+
+MAGIC = b"ASTCAP01"
+VERSION = 1
+INDEX_MAGIC = b"ASTCAPIX"
+
+HEADER = struct.Struct("<8sHH4x")
+FRAME_HEADER = struct.Struct("<IdI")
+ENTITY = struct.Struct("<B3xffffff")
+TRAILER = struct.Struct("<QI4x8s")
+
+# Entity kind codes stored in each record; append new kinds so old codes keep their meaning
+KINDS = ["Player", "Asteroid", "Shot", "PowerUp", "Bomb", "Explosion", "Missile", "Beam"]
+KIND_CODES = {name: code for code, name in enumerate(KINDS)}
+
+if np is not None:
+    ENTITY_DTYPE = np.dtype([
+        ("kind", "u1"), ("_pad", "V3"),
+        ("x", "<f4"), ("y", "<f4"),
+        ("vx", "<f4"), ("vy", "<f4"),
+        ("radius", "<f4"), ("rotation", "<f4"),
+    ])
+
+
+class CaptureWriter:
+    """Appends one frame of world state per call to capture()."""
+
+    GROUPS = ("asteroids", "shots", "powerups", "bombs", "explosions", "beams")
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, ENTITY.size))
+        self.offsets = array("Q")
+        self.buffer = bytearray()
+
+    def capture(self, world, frame, sim_time):
+        """Write every entity in `world` as it is right now."""
+        sprites = list(world.players)
+        for name in self.GROUPS:
+            sprites.extend(getattr(world, name))
+
+        size = FRAME_HEADER.size + ENTITY.size * len(sprites)
+        if len(self.buffer) < size:
+            self.buffer = bytearray(size)
+        FRAME_HEADER.pack_into(self.buffer, 0, frame, sim_time, len(sprites))
+
+        pack_into = ENTITY.pack_into
+        offset = FRAME_HEADER.size
+        for sprite in sprites:
+            position = sprite.position
+            velocity = getattr(sprite, "velocity", None)
+            pack_into(
+                self.buffer, offset,
+                KIND_CODES.get(sprite.__class__.__name__, 255),
+                position.x, position.y,
+                velocity.x if velocity is not None else 0.0,
+                velocity.y if velocity is not None else 0.0,
+                getattr(sprite, "radius", 0.0),
+                getattr(sprite, "rotation", 0.0),
+            )
+            offset += ENTITY.size
+
+        self.offsets.append(self.file.tell())
+        self.file.write(memoryview(self.buffer)[:size])
+
+    def close(self):
+        """Write the frame index and trailer, then close the file."""
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        padding = -index_offset % 8  # keep the u64 index aligned in the map
+        self.file.write(bytes(padding))
+        index_offset += padding
+        self.offsets.tofile(self.file)
+        self.file.write(TRAILER.pack(index_offset, len(self.offsets), INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+
+
+class CaptureReader:
+    """Random access to a capture file through a read-only memory map."""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, version, entity_size = HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a state capture")
+        if version != VERSION or entity_size != ENTITY.size:
+            raise ValueError(f"Unsupported capture version {version}")
+
+        self.offsets = self._read_index()
+
+    def _read_index(self):
+        """Zero-copy view of the stored index, or a rebuilt one."""
+        if len(self.view) >= HEADER.size + TRAILER.size:
+            index_offset, count, magic = TRAILER.unpack_from(self.view, len(self.view) - TRAILER.size)
+            if magic == INDEX_MAGIC:
+                return self.view[index_offset:index_offset + count * 8].cast("Q")
+
+        # No trailer: the writer never closed, so walk frame headers
+        offsets = array("Q")
+        offset = HEADER.size
+        end = len(self.view)
+        while offset + FRAME_HEADER.size <= end:
+            _, _, count = FRAME_HEADER.unpack_from(self.view, offset)
+            frame_end = offset + FRAME_HEADER.size + count * ENTITY.size
+            if frame_end > end:
+                break  # torn final frame
+            offsets.append(offset)
+            offset = frame_end
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def header(self, index):
+        """(frame number, sim time, entity count) of the index-th frame."""
+        return FRAME_HEADER.unpack_from(self.view, self.offsets[index])
+
+    def records(self, index):
+        """Raw entity records of a frame as a memoryview into the map."""
+        offset = self.offsets[index]
+        _, _, count = FRAME_HEADER.unpack_from(self.view, offset)
+        start = offset + FRAME_HEADER.size
+        return self.view[start:start + count * ENTITY.size]
+
+    def entities(self, index):
+        """Decoded (kind, x, y, vx, vy, radius, rotation) tuples of a frame."""
+        return [
+            (KINDS[kind] if kind < len(KINDS) else "?", *fields)
+            for kind, *fields in ENTITY.iter_unpack(self.records(index))
+        ]
+
+    def array(self, index):
+        """A frame as a NumPy structured array sharing the map's memory."""
+        if np is None:
+            raise ImportError("CaptureReader.array() requires numpy")
+        return np.frombuffer(self.records(index), dtype=ENTITY_DTYPE)
+
+    def find_frame(self, frame):
+        """Index of the capture entry for a game frame number (binary search)."""
+        lo, hi = 0, len(self.offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.header(mid)[0] < frame:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(self.offsets) or self.header(lo)[0] != frame:
+            raise KeyError(f"Frame {frame} not in capture")
+        return lo
+
+    def close(self):
+        # Views into the map must be released before it can close
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect a binary state capture.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="frame range and entity totals")
+    info.add_argument("path")
+    dump = sub.add_parser("dump", help="entities of one frame as JSON lines")
+    dump.add_argument("path")
+    dump.add_argument("--frame", type=int, required=True, help="game frame number")
+    args = parser.parse_args(argv)
+
+    with CaptureReader(args.path) as reader:
+        if args.command == "info":
+            if not len(reader):
+                print(json.dumps({"frames": 0}))
+                return
+            first, last = reader.header(0), reader.header(len(reader) - 1)
+            print(json.dumps({
+                "frames": len(reader),
+                "first_frame": first[0],
+                "last_frame": last[0],
+                "duration_s": round(last[1] - first[1], 3),
+                "max_entities": max(reader.header(i)[2] for i in range(len(reader))),
+            }))
+        else:
+            index = reader.find_frame(args.frame)
+            for kind, x, y, vx, vy, radius, rotation in reader.entities(index):
+                print(json.dumps({
+                    "kind": kind, "x": x, "y": y, "vx": vx, "vy": vy,
+                    "radius": radius, "rotation": rotation,
+                }))
+
+
+if __name__ == "__main__":
+    main()
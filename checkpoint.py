@@ -0,0 +1,168 @@
+"""
+Checkpoints: save a whole World to disk and restore it later.
+
+A checkpoint holds every sprite (in update order) with its full state,
+including the player's weapon, bomb and power-up timers, plus score
+and stats, lives and the global RNG state, so a restored world plays
+on exactly as the saved one would have. Stress scenarios can start
+from a pre-built heavy field instead of playing minutes to reach it.
+
+The format is a short header followed by a zlib-compressed pickle.
+Only load checkpoints you created yourself: unpickling runs code.
+
+    save_checkpoint(world, "heavy.ckpt")
+    world = load_checkpoint("heavy.ckpt", controller=my_input)
+
+Heavy starting states can be built headlessly with the bot pilot:
+
+    python checkpoint.py build heavy.ckpt --seconds 300 --seed 7
+    python checkpoint.py info heavy.ckpt
+    python simulate.py --checkpoint heavy.ckpt --seeds 8
+"""
+import argparse
+import copyreg
+import io
+import json
+import pickle
+import random
+import struct
+import zlib
+
+import pygame
+
+from controls import BotInput, KeyboardInput
+from player import Player
+from asteroidfield import AsteroidField
+from world import World
+
+MAGIC = b"ASTCKP01"
+HEADER = struct.Struct("<8sI")  # magic, uncompressed payload size
+
+# Attributes never written: group membership is rebuilt from `containers`
+# on load, and input providers belong to whoever resumes the game.
+_SKIPPED = {"_Sprite__g", "controller"}
+
+
+def _reduce_vector(vector):
+    return pygame.Vector2, (vector.x, vector.y)
+
+
+class _Pickler(pickle.Pickler):
+    # Vector2's default reduction is several times larger than two floats
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[pygame.Vector2] = _reduce_vector
+
+
+def _sprite_state(sprite):
+    state = sprite.__getstate__()  # honours per-class overrides (e.g. PowerUp)
+    return {key: value for key, value in state.items() if key not in _SKIPPED}
+
+
+def world_state(world):
+    """Everything needed to rebuild `world`, as a picklable dict."""
+    return {
+        "lives": world.lives,
+        "game_over": world.game_over,
+        "stats": world.stats,
+        "random": random.getstate(),
+        "sprites": [(type(sprite), _sprite_state(sprite)) for sprite in world.updatable],
+    }
+
+
+def restore_world(state, controller=None):
+    """Build a new World from a `world_state` dict."""
+    world = World(lives=state["lives"], populate=False)
+    world.game_over = state["game_over"]
+    world.stats = state["stats"]
+
+    for cls, attributes in state["sprites"]:
+        sprite = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(sprite)
+        if hasattr(sprite, "__setstate__"):
+            sprite.__setstate__(attributes)
+        else:
+            sprite.__dict__.update(attributes)
+        sprite.add(cls.containers)  # after its state: indexed groups read positions
+        if cls is Player:
+            # The first ship is the local one; any others get a keyboard stub
+            sprite.controller = (controller if world.player is None else None) or KeyboardInput()
+            world.players.append(sprite)
+            if world.player is None:
+                world.player = sprite
+        elif cls is AsteroidField:
+            world.asteroid_field = sprite
+
+    if world.player is None:
+        raise ValueError("Checkpoint has no player")
+    random.setstate(state["random"])
+    return world
+
+
+def save_checkpoint(world, path):
+    """Write `world` to `path`; returns the file size in bytes."""
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(world_state(world))
+    payload = buffer.getvalue()
+    data = HEADER.pack(MAGIC, len(payload)) + zlib.compress(payload, 6)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def load_checkpoint(path, controller=None):
+    """Read a checkpoint into a new World driven by `controller`."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a checkpoint")
+    magic, size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a checkpoint")
+    payload = zlib.decompress(data[HEADER.size:])
+    if len(payload) != size:
+        raise ValueError(f"{path} is truncated")
+    return restore_world(pickle.loads(payload), controller)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect world checkpoints.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="play headlessly with the bot, then save")
+    build.add_argument("path")
+    build.add_argument("--seconds", type=float, default=120.0, help="simulated play time")
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--lives", type=int, default=1000,
+                       help="generous by default so the bot survives to the end")
+    info = sub.add_parser("info", help="what a checkpoint contains")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    import logger
+    from simulate import SIM_DT
+    logger.set_enabled(False)
+
+    if args.command == "build":
+        random.seed(args.seed)
+        world = World(lives=args.lives)
+        world.player.controller = BotInput(world.asteroids)
+        for _ in range(round(args.seconds / SIM_DT)):
+            world.update(SIM_DT)
+        size = save_checkpoint(world, args.path)
+        print(json.dumps({"path": args.path, "bytes": size, "sprites": len(world.updatable)}))
+    else:
+        world = load_checkpoint(args.path)
+        counts = {}
+        for sprite in world.updatable:
+            name = type(sprite).__name__
+            counts[name] = counts.get(name, 0) + 1
+        print(json.dumps({
+            "time_s": round(world.stats.time, 3),
+            "score": world.score,
+            "lives": world.lives,
+            "game_over": world.game_over,
+            "sprites": counts,
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, CULL_MARGIN
 
 
 class CircleShape(pygame.sprite.Sprite):
@@ -9,18 +9,33 @@ class CircleShape(pygame.sprite.Sprite):
     """
     
     def __init__(self, x, y, radius):
+        # Set geometry first: spatially indexed groups read it when adding
+        self.position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.radius = radius
+        
         if hasattr(self, 'containers'):
             super().__init__(self.containers)
         else:
             super().__init__()
-        
-        self.position = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(0, 0)
-        self.radius = radius
     
     def draw(self, screen):
         pass
     
+    def draw_extent(self):
+        """
+        Radius around `position` that draw() can touch, for culling.
+        None means the sprite can't be bounded that way and is always drawn.
+        """
+        return self.radius + CULL_MARGIN
+    
+    def stamp(self):
+        """
+        (surface, topleft) to blit instead of calling draw(), letting the
+        renderer batch it with its neighbours; None to draw() as usual.
+        """
+        return None
+    
     def update(self, dt):
         pass
     
@@ -0,0 +1,332 @@
+"""
+Collision passes, serial and vectorized, plus a parallel shot pass.
+
+World's interactions with asteroids (shots and bomb blasts) each come
+in two interchangeable forms:
+
+- serial: spatial-index queries and per-pair tests in Python;
+- kernel: whole populations at once as NumPy arrays, through
+  circle_pairs(), which broadcasts one population against the other in
+  chunks so memory stays bounded.
+
+Ship passes (ship_hits, pickups) are serial only: one ship against at
+most ASTEROID_MAX_COUNT asteroids, or a few power-ups, is far below the
+size where building arrays pays off.
+
+Both forms return the same pairs in the same order. Where order
+decides the outcome it is defined by the data, not by the index: a
+shot is taken by the nearest asteroid it touches, and a ship or blast
+handles the asteroids it touches nearest first. Squared distances are
+computed with the same operations on both sides, so orderings match
+exactly. use_kernel() picks the form per pass, since building the
+arrays only pays off once a pass has enough pairs.
+
+For the largest shot passes ParallelCollider splits the field into
+bands of spatial-grid rows and runs the kernel on each band's shots
+and the asteroids that can reach them, one band per task on a shared
+thread pool. NumPy releases the GIL inside these operations, so bands
+run on separate cores. Results are merged in shot order and applied by
+World on the main thread, so scheduling never changes the outcome.
+
+NumPy is optional: without it every pass stays serial.
+
+    python collisions.py bench --shots 3000 --asteroids 400 --workers 1 2 4
+"""
+import argparse
+import json
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; every pass falls back to serial
+    np = None
+
+import constants
+from constants import COLLISION_PARALLEL_MIN_PAIRS, COLLISION_CHUNK_ELEMENTS
+
+_executors = {}  # {workers: ThreadPoolExecutor}, shared by every world in the process
+
+
+def _executor(workers):
+    executor = _executors.get(workers)
+    if executor is None:
+        executor = _executors[workers] = ThreadPoolExecutor(workers, thread_name_prefix="collide")
+    return executor
+
+
+def use_kernel(count_a, count_b):
+    """Whether a pass over count_a x count_b pairs should use the NumPy kernels."""
+    return (np is not None and constants.COLLISION_VECTORIZED
+            and count_a * count_b >= constants.COLLISION_VECTOR_MIN_PAIRS)
+
+
+def columns(sprites, radii=None):
+    """(x, y, radius) float arrays of `sprites`; `radii` overrides their radii."""
+    data = np.array([(s.position.x, s.position.y, s.radius) for s in sprites],
+                    dtype=float).reshape(-1, 3)
+    return data[:, 0], data[:, 1], data[:, 2] if radii is None else np.asarray(radii, dtype=float)
+
+
+def circle_pairs(a, b, max_elements=COLLISION_CHUNK_ELEMENTS):
+    """
+    (i, j, distance_sq) arrays for every circle i of `a` touching circle
+    j of `b`, ordered by i then j. `a` and `b` are (x, y, radius) column
+    arrays. Rows of `a` are processed in chunks so no temporary holds
+    more than `max_elements` values.
+    """
+    ax, ay, ar = a
+    bx, by, br = b
+    found_i, found_j, found_d = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)], [np.empty(0)]
+    step = max(1, max_elements // max(1, len(bx)))
+    for start in range(0, len(ax) if len(bx) else 0, step):
+        stop = min(len(ax), start + step)
+        # Same offsets as SpatialGrid.query_radius / distance_sq.
+        # Rows first: dy * dy <= limit * limit is implied by a hit, and
+        # leaves few pairs to finish with dx.
+        dy = by[None, :] - ay[start:stop, None]
+        limit = br[None, :] + ar[start:stop, None]
+        limit *= limit
+        i, j = np.nonzero(dy * dy <= limit)
+        dy, limit = dy[i, j], limit[i, j]
+        i += start
+        dx = bx[j] - ax[i]
+        distance_sq = dx * dx + dy * dy
+        hit = distance_sq <= limit
+        found_i.append(i[hit])
+        found_j.append(j[hit])
+        found_d.append(distance_sq[hit])
+    return np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_d)
+
+
+def _sorted_pairs(i, j, distance_sq):
+    """Pairs ordered by i, then nearest first, then j."""
+    order = np.lexsort((j, distance_sq, i))
+    return i[order], j[order]
+
+
+def _nearest_per_row(i, j, distance_sq):
+    """For each distinct i, the j with the smallest distance (ties: lowest j)."""
+    i, j = _sorted_pairs(i, j, distance_sq)
+    first = np.ones(len(i), dtype=bool)
+    first[1:] = i[1:] != i[:-1]
+    return i[first], j[first]
+
+
+def _nearest_first(sprites, position, distance_sq):
+    return sorted(sprites, key=lambda sprite: distance_sq(position, sprite.position))
+
+
+def shot_hits(shots, asteroids):
+    """[(shot, nearest asteroid it touches)] in the order of `shots`."""
+    shots = list(shots)
+    grid = asteroids.index
+    if use_kernel(len(shots), len(asteroids)):
+        rocks = list(asteroids)
+        pairs = circle_pairs(columns(shots), columns(rocks))
+        return [(shots[i], rocks[j]) for i, j in zip(*(a.tolist() for a in _nearest_per_row(*pairs)))]
+
+    hits = []
+    for shot in shots:
+        nearby = asteroids.query_radius(shot.position, shot.radius)
+        if nearby:
+            hits.append((shot, _nearest_first(nearby, shot.position, grid.distance_sq)[0]))
+    return hits
+
+
+def blast_hits(bombs, asteroids):
+    """For each of `bombs`, the asteroids its blast reaches, nearest first."""
+    grid = asteroids.index
+    if use_kernel(len(bombs), len(asteroids)):
+        rocks = list(asteroids)
+        blasts = columns(bombs, [bomb.get_blast_radius() for bomb in bombs])
+        i, j = _sorted_pairs(*circle_pairs(blasts, columns(rocks)))
+        caught = [[] for _ in bombs]
+        for bomb, rock in zip(i.tolist(), j.tolist()):
+            caught[bomb].append(rocks[rock])
+        return caught
+
+    return [
+        _nearest_first(asteroids.query_radius(bomb.position, bomb.get_blast_radius()),
+                       bomb.position, grid.distance_sq)
+        for bomb in bombs
+    ]
+
+
+def ship_hits(player, asteroids):
+    """
+    Asteroids touching the ship's triangle, nearest first. Candidates are
+    those whose circle reaches the circle through the triangle's corners
+    (Player.hit_radius); the triangle test then decides.
+    """
+    grid = asteroids.index
+    nearby = asteroids.query_radius(player.position, player.hit_radius)
+    return _nearest_first([rock for rock in nearby if player.collides_with(rock)],
+                          player.position, grid.distance_sq)
+
+
+def pickups(powerups, players):
+    """[(power-up, first ship touching it)] in the order of `powerups`."""
+    found = []
+    for powerup in powerups:
+        for player in players:
+            if player.collides_with(powerup):
+                found.append((powerup, player))
+                break
+    return found
+
+
+class ParallelCollider:
+    """Shot pass over row bands of an asteroid SpatialGroup on a thread pool."""
+
+    def __init__(self, workers, min_pairs=COLLISION_PARALLEL_MIN_PAIRS):
+        if np is None:
+            raise ImportError("ParallelCollider requires numpy")
+        self.workers = workers
+        self.min_pairs = min_pairs
+        self.executor = _executor(workers)
+
+    def worthwhile(self, shots, asteroids):
+        """Whether the pass is big enough to beat the single-threaded one."""
+        return len(shots) * len(asteroids) >= self.min_pairs
+
+    @staticmethod
+    def _band(shot_ids, shots, rock_ids, rocks):
+        i, j = _nearest_per_row(*circle_pairs(shots, rocks))
+        return shot_ids[i], rock_ids[j]
+
+    def shot_hits(self, shots, asteroids):
+        """
+        Same result as shot_hits(shots, asteroids). `asteroids` must be a
+        reindexed SpatialGroup.
+        """
+        shots = list(shots)
+        if not shots or not asteroids:
+            return []
+        grid = asteroids.index
+        rock_list = list(asteroids)
+        rock_ids = {asteroid: i for i, asteroid in enumerate(rock_list)}
+
+        # Bucket shots into bands of consecutive grid rows
+        bands = min(grid.rows, self.workers * 2)
+        band_rows = [range(band * grid.rows // bands, (band + 1) * grid.rows // bands)
+                     for band in range(bands)]
+        band_of_row = {row: band for band, rows in enumerate(band_rows) for row in rows}
+        band_shots = [[] for _ in range(bands)]
+        max_shot_radius = 0
+        for i, shot in enumerate(shots):
+            band_shots[band_of_row[grid._cell(shot.position.x, shot.position.y)[1]]].append(i)
+            max_shot_radius = max(max_shot_radius, shot.radius)
+
+        shot_columns = np.stack(columns(shots))
+        rock_columns = np.stack(columns(rock_list))
+        # Rows beyond a band's edge whose asteroids can still reach into it
+        margin = math.ceil((max_shot_radius + grid.max_radius) / grid.cell_height)
+
+        futures = []
+        for band, members in enumerate(band_shots):
+            if not members:
+                continue
+            own = band_rows[band]
+            if len(own) + 2 * margin >= grid.rows:
+                rows = set(range(grid.rows))
+            else:
+                rows = {row % grid.rows for row in range(own.start - margin, own.stop + margin)}
+            candidates = [
+                rock_ids[rock]
+                for (_, row), bucket in grid.cells.items() if row in rows
+                for rock in bucket
+            ]
+            if not candidates:
+                continue
+            members = np.array(members, dtype=np.intp)
+            candidates = np.array(candidates, dtype=np.intp)
+            futures.append(self.executor.submit(
+                self._band,
+                members, tuple(shot_columns[:, members]),
+                candidates, tuple(rock_columns[:, candidates]),
+            ))
+
+        # Merge in shot order, whatever order the bands finished in
+        hits = sorted(
+            (shot, rock)
+            for future in futures
+            for shot, rock in zip(*(ids.tolist() for ids in future.result()))
+        )
+        return [(shots[shot], rock_list[rock]) for shot, rock in hits]
+
+
+def make_collider(workers=None):
+    """
+    A ParallelCollider with `workers` threads (default COLLISION_WORKERS),
+    or None when that is 0 or NumPy is missing.
+    """
+    if workers is None:
+        workers = constants.COLLISION_WORKERS
+    if workers <= 0 or np is None:
+        return None
+    return ParallelCollider(workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the collision passes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="time the shot pass on a random field")
+    bench.add_argument("--shots", type=int, default=3000)
+    bench.add_argument("--asteroids", type=int, default=400)
+    bench.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    bench.add_argument("--repeat", type=int, default=20)
+    bench.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import pygame
+    from asteroid import AsteroidGroup
+    from constants import (
+        SCREEN_WIDTH, SCREEN_HEIGHT, SHOT_RADIUS, ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS,
+    )
+
+    class Body(pygame.sprite.Sprite):
+        def __init__(self, radius):
+            super().__init__()
+            self.position = pygame.Vector2(random.uniform(0, SCREEN_WIDTH),
+                                           random.uniform(0, SCREEN_HEIGHT))
+            self.radius = radius
+
+    random.seed(args.seed)
+    asteroids = AsteroidGroup(
+        Body(random.uniform(ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS)) for _ in range(args.asteroids))
+    shots = [Body(SHOT_RADIUS) for _ in range(args.shots)]
+
+    def timed(run):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = run()
+        return result, (time.perf_counter() - start) * 1000 / args.repeat
+
+    vectorized = constants.COLLISION_VECTORIZED
+    constants.COLLISION_VECTORIZED = False
+    expected, serial_ms = timed(lambda: shot_hits(shots, asteroids))
+    constants.COLLISION_VECTORIZED = vectorized
+    report = {"shots": args.shots, "asteroids": args.asteroids, "hits": len(expected),
+              "serial_ms": round(serial_ms, 3)}
+    if np is not None:
+        result, kernel_ms = timed(lambda: shot_hits(shots, asteroids))
+        report["kernel"] = {"ms": round(kernel_ms, 3), "speedup": round(serial_ms / kernel_ms, 2),
+                            "matches_serial": result == expected}
+        report["parallel"] = []
+        for workers in args.workers:
+            collider = ParallelCollider(workers)
+            result, parallel_ms = timed(lambda: collider.shot_hits(shots, asteroids))
+            report["parallel"].append({
+                "workers": workers,
+                "ms": round(parallel_ms, 3),
+                "speedup": round(serial_ms / parallel_ms, 2),
+                "matches_serial": result == expected,
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
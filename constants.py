@@ -8,6 +8,23 @@ ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE_SECONDS = 0.8
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+ASTEROID_HEALTH_PER_RADIUS = 1 / ASTEROID_MIN_RADIUS  # smallest rock: one standard shot
+
+# ============== ASTEROID POPULATION ==============
+# Mass is area relative to the smallest rock (1, 4, 9 for the three kinds);
+# splitting never adds mass, so the mass budget also bounds split cascades.
+ASTEROID_MAX_COUNT = 120
+ASTEROID_MASS_BUDGET = 300
+ASTEROID_THROTTLE_PRESSURE = 0.7  # spawning slows above this fraction of a budget
+# Difficulty curve: each wave scales the base spawn rate, sets the speed range
+# and the largest kind spawned. Past the last wave, it repeats with the rate
+# raised by ASTEROID_WAVE_RAMP per extra wave.
+ASTEROID_WAVES = [
+    {"duration": 30, "spawn_rate": 0.6, "speed": (40, 80), "max_kind": 2},
+    {"duration": 60, "spawn_rate": 1.0, "speed": (40, 100), "max_kind": 3},
+    {"duration": 90, "spawn_rate": 1.3, "speed": (50, 120), "max_kind": 3},
+]
+ASTEROID_WAVE_RAMP = 0.1
 SHOT_RADIUS = 5
 PLAYER_SHOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN_SECONDS = 0.3
@@ -43,6 +60,7 @@ WEAPON_STANDARD = 0
 WEAPON_SPREAD = 1
 WEAPON_RAPID = 2
 WEAPON_LASER = 3
+WEAPON_HOMING = 4
 
 WEAPON_CONFIGS = {
     WEAPON_STANDARD: {
@@ -74,16 +92,34 @@ WEAPON_CONFIGS = {
     },
     WEAPON_LASER: {
         "name": "Laser",
-        "cooldown": 0.05,
-        "shot_speed": 800,
+        "cooldown": 0,
+        "shot_speed": 0,
         "shot_count": 1,
         "spread_angle": 0,
         "color": (100, 200, 255),  # cyan
-        "damage": 0.3,
-        "size": 2,  # smaller projectile
+        "damage": 4.0,  # per second while the beam touches an asteroid
+        "beam": True,  # continuous ray instead of projectiles
+        "range": 500,
+        "size": 2,  # beam line width
+    },
+    WEAPON_HOMING: {
+        "name": "Homing",
+        "cooldown": 0.6,
+        "shot_speed": 350,
+        "shot_count": 1,
+        "spread_angle": 0,
+        "color": (255, 160, 60),  # orange
+        "damage": 2,
+        "size": 4,
+        "homing": True,
+        "turn_rate": 240,  # degrees per second
+        "lock_range": 400,  # ignore asteroids further away than this
     },
 }
 
+# Order of the number keys 1-5 (and of the bot's weapon rotation)
+WEAPON_ORDER = [WEAPON_STANDARD, WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER, WEAPON_HOMING]
+
 # ============== BOMBS ==============
 BOMB_RADIUS = 12
 BOMB_FUSE_TIME = 2.0  # seconds
@@ -91,6 +127,7 @@ BOMB_EXPLOSION_RADIUS = 150
 BOMB_MAX_COUNT = 3  # max bombs per life
 BOMB_DROP_SPEED = 50  # backward velocity when dropped
 BOMB_COLORS = [(255, 80, 80), (200, 50, 50)]  # blinking colors
+BOMB_FUSE_STEPS = 36  # pre-rendered fuse arc lengths (10 degrees each)
 
 # ============== POWER-UPS ==============
 POWERUP_SPAWN_CHANCE = 0.25  # chance when asteroid destroyed
@@ -135,3 +172,41 @@ ASTEROID_VERTEX_COUNT = 10  # vertices for lumpy shape
 ASTEROID_LUMP_VARIANCE = 0.3  # 0-1, how lumpy (0.3 = 30% variance)
 ASTEROID_ROTATION_SPEED_MIN = 20  # degrees per second
 ASTEROID_ROTATION_SPEED_MAX = 80
+
+# ============== RENDERING ==============
+CULL_MARGIN = 12  # glows, outlines and lumps drawn past a sprite's radius
+
+# Draw order of the world's sprites, back to front, carried as `_layer`.
+# main() draws the starfield before the world and the HUD after it.
+LAYER_ASTEROIDS = 1
+LAYER_ITEMS = 2  # power-ups and bombs
+LAYER_SHOTS = 3  # shots, missiles and beams
+LAYER_PLAYER = 4
+LAYER_PARTICLES = 5
+
+STAMP_PHASE_BUCKETS = 16  # animation steps pre-rendered per looping effect
+
+# ============== BEAM ==============
+BEAM_LINGER = 0.1  # seconds a beam stays up after the trigger is released
+
+# ============== SPATIAL INDEX ==============
+SPATIAL_CELL_SIZE = ASTEROID_MAX_RADIUS * 2  # one large asteroid spans at most 2x2 cells
+
+# ============== COLLISIONS ==============
+COLLISION_WORKERS = 0  # threads for the shot/asteroid narrow phase; 0 keeps it serial
+COLLISION_PARALLEL_MIN_PAIRS = 20000  # shot x asteroid pairs below which serial is faster
+COLLISION_VECTORIZED = True  # use the NumPy kernels (when installed) for large passes
+COLLISION_VECTOR_MIN_PAIRS = 2000  # pairs below which the spatial index is cheaper
+COLLISION_CHUNK_ELEMENTS = 1 << 18  # cap on pairs held in one kernel temporary
+
+# ============== FRAME SCHEDULER ==============
+FRAME_RATE = 60
+SCHEDULER_MARGIN_MS = 2  # slack left unscheduled for the flip and timer jitter
+SCHEDULER_MAX_WAIT_FRAMES = 30  # a job queued this long runs even without slack
+LOG_FLUSH_INTERVAL = 1.0  # seconds between deferred log flushes
+
+# ============== GARBAGE COLLECTION ==============
+GC_MANAGED = True  # no automatic GC during play; collect in frame slack instead (gcmanager.py)
+GC_YOUNG_THRESHOLD = 700  # new container objects before a young collection (CPython's default)
+GC_YOUNG_PER_OLDER = 10  # collections of a generation per one of the next older
+GC_REPORT_INTERVAL = 1.0  # seconds between `gc` log events
@@ -0,0 +1,207 @@
+"""
+Input providers that drive the player ship.
+A provider turns keyboard state, a recording, or a bot policy into one
+Controls snapshot per frame, so Player never reads devices directly.
+"""
+import json
+import math
+
+import pygame
+
+from constants import BOMB_EXPLOSION_RADIUS, PLAYER_TURN_SPEED, WEAPON_ORDER
+
+
+class Controls:
+    """What the pilot wants to do this frame."""
+
+    def __init__(self, thrust=False, reverse=False, turn=0, fire=False, bomb=False, weapon=None):
+        self.thrust = thrust
+        self.reverse = reverse
+        self.turn = turn  # -1 (left) .. 1 (right)
+        self.fire = fire
+        self.bomb = bomb
+        self.weapon = weapon  # weapon index to switch to, or None
+
+    def to_dict(self):
+        return {
+            "thrust": self.thrust,
+            "reverse": self.reverse,
+            "turn": self.turn,
+            "fire": self.fire,
+            "bomb": self.bomb,
+            "weapon": self.weapon,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class InputProvider:
+    """Base provider: no input at all."""
+
+    def handle_event(self, event):
+        """Receive a pygame event (only the keyboard cares)."""
+
+    def poll(self, player, dt):
+        """Return the Controls for this frame."""
+        return Controls()
+
+
+class KeyboardInput(InputProvider):
+    """Live keyboard: WASD/arrows, SPACE to shoot, B to bomb, 1-5 weapons."""
+
+    WEAPON_KEYS = {pygame.K_1 + index: index for index in range(len(WEAPON_ORDER))}
+
+    def __init__(self):
+        self.pending_weapon = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key in self.WEAPON_KEYS:
+            self.pending_weapon = self.WEAPON_KEYS[event.key]
+
+    def poll(self, player, dt):
+        keys = pygame.key.get_pressed()
+
+        turn = 0
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            turn -= 1
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            turn += 1
+
+        controls = Controls(
+            thrust=keys[pygame.K_w] or keys[pygame.K_UP],
+            reverse=keys[pygame.K_s] or keys[pygame.K_DOWN],
+            turn=turn,
+            fire=keys[pygame.K_SPACE],
+            bomb=keys[pygame.K_b],
+            weapon=self.pending_weapon,
+        )
+        self.pending_weapon = None
+        return controls
+
+
+class RecordedInput(InputProvider):
+    """
+    Replays a recorded stream of Controls, one per frame.
+    With `loop` the stream restarts when it runs out (for soak tests).
+    """
+
+    def __init__(self, frames, loop=False):
+        self.frames = list(frames)
+        self.loop = loop
+        self.index = 0
+
+    @classmethod
+    def load(cls, path, loop=False):
+        """Load a recording written by InputRecorder.save()."""
+        with open(path) as f:
+            return cls((Controls.from_dict(json.loads(line)) for line in f if line.strip()), loop)
+
+    def poll(self, player, dt):
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return Controls()
+            self.index = 0
+        controls = self.frames[self.index]
+        self.index += 1
+        return controls
+
+
+class InputRecorder(InputProvider):
+    """Wraps another provider and keeps every Controls it produces."""
+
+    def __init__(self, source):
+        self.source = source
+        self.frames = []
+
+    def handle_event(self, event):
+        self.source.handle_event(event)
+
+    def poll(self, player, dt):
+        controls = self.source.poll(player, dt)
+        self.frames.append(controls)
+        return controls
+
+    def save(self, path):
+        """Write the recording as JSON lines."""
+        with open(path, "w") as f:
+            for controls in self.frames:
+                f.write(json.dumps(controls.to_dict()) + "\n")
+
+
+class RemoteInput(InputProvider):
+    """
+    Controls pushed from elsewhere (e.g. a network client). The latest
+    state is held until replaced; a weapon switch is applied only once.
+    """
+
+    def __init__(self):
+        self.controls = Controls()
+
+    def push(self, controls):
+        self.controls = controls
+
+    def poll(self, player, dt):
+        controls = self.controls
+        if controls.weapon is not None:
+            self.controls = Controls(**{**controls.to_dict(), "weapon": None})
+        return controls
+
+
+def nearest_threat(position, asteroids):
+    """
+    Find the asteroid whose edge is closest to `position`.
+    Returns (asteroid, gap, crowd) where crowd counts asteroids inside
+    bomb range; (None, inf, 0) for an empty field.
+    """
+    nearest = None
+    nearest_gap = math.inf
+    crowd = 0
+    for asteroid in asteroids:
+        gap = position.distance_to(asteroid.position) - asteroid.radius
+        if gap < nearest_gap:
+            nearest, nearest_gap = asteroid, gap
+        if gap <= BOMB_EXPLOSION_RADIUS:
+            crowd += 1
+    return nearest, nearest_gap, crowd
+
+
+class BotInput(InputProvider):
+    """
+    Scripted pilot: turn towards the nearest threat and fire, back off when
+    it gets close, bomb crowds, and rotate through every weapon.
+    """
+
+    def __init__(self, asteroids, weapon_switch_seconds=10.0, danger_distance=120,
+                 bomb_crowd=4, aim_tolerance=10):
+        self.asteroids = asteroids
+        self.weapon_switch_seconds = weapon_switch_seconds
+        self.danger_distance = danger_distance
+        self.bomb_crowd = bomb_crowd
+        self.aim_tolerance = aim_tolerance
+        self.clock = 0.0
+
+    def poll(self, player, dt):
+        self.clock += dt
+
+        # Exercise every weapon over the course of a run
+        weapon = int(self.clock / self.weapon_switch_seconds) % len(WEAPON_ORDER)
+
+        target, gap, crowd = nearest_threat(player.position, self.asteroids)
+        if target is None:
+            return Controls(weapon=weapon)
+
+        # Turn towards the target without overshooting it
+        forward = pygame.Vector2(0, 1).rotate(player.rotation)
+        angle = forward.angle_to(target.position - player.position)
+        angle = (angle + 180) % 360 - 180
+        turn = max(-1, min(1, angle / (PLAYER_TURN_SPEED * dt))) if dt > 0 else 0
+
+        return Controls(
+            reverse=gap < self.danger_distance,  # back away while shooting
+            turn=turn,
+            fire=abs(angle) < self.aim_tolerance,
+            bomb=crowd >= self.bomb_crowd,
+            weapon=weapon,
+        )
@@ -11,7 +11,26 @@ from constants import (
     EXPLOSION_PARTICLE_SPEED_MAX,
     EXPLOSION_DURATION,
     EXPLOSION_COLORS,
+    LAYER_PARTICLES,
 )
+from stamps import stamps
+
+
+def glow_stamp(color, size, alpha):
+    """
+    The soft halo around a particle of (whole) `size` at glow `alpha`.
+    Particles fade one alpha step at a time, so every look recurs across
+    explosions and each is rendered once.
+    """
+    key = ("particle_glow", color, size, alpha)
+    return stamps.get(key, lambda: _render_glow(color, size, alpha))
+
+
+def _render_glow(color, size, alpha):
+    r, g, b = color
+    glow_surf = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+    pygame.draw.circle(glow_surf, (r, g, b, alpha), (size * 2, size * 2), size * 2)
+    return glow_surf
 
 
 class Particle:
@@ -35,19 +54,10 @@ class Particle:
         """Draw particle with current alpha."""
         if self.alpha <= 0:
             return
-        # Create a temporary surface for alpha blending
-        r, g, b = self.color
-        color_with_alpha = (r, g, b, int(self.alpha))
         size_int = max(1, int(self.size))
         
         # Draw glow effect
-        glow_surf = pygame.Surface((size_int * 4, size_int * 4), pygame.SRCALPHA)
-        pygame.draw.circle(
-            glow_surf,
-            (r, g, b, int(self.alpha * 0.3)),
-            (size_int * 2, size_int * 2),
-            size_int * 2
-        )
+        glow_surf = glow_stamp(self.color, size_int, int(self.alpha * 0.3))
         surface.blit(glow_surf, (self.position.x - size_int * 2, self.position.y - size_int * 2))
         
         # Draw core particle
@@ -60,6 +70,8 @@ class Explosion(pygame.sprite.Sprite):
     Auto-removes itself when animation completes.
     """
     
+    _layer = LAYER_PARTICLES
+    
     def __init__(self, x, y, radius=30):
         if hasattr(self, 'containers'):
             super().__init__(self.containers)
@@ -68,6 +80,8 @@ class Explosion(pygame.sprite.Sprite):
         
         self.position = pygame.Vector2(x, y)
         self.timer = EXPLOSION_DURATION
+        self.particles_drawn = 0  # from the last draw(), for render stats
+        self.particles_culled = 0
         self.fade_rate = 255 / EXPLOSION_DURATION
         
         # Create particles
@@ -108,10 +122,29 @@ class Explosion(pygame.sprite.Sprite):
         if self.timer <= 0:
             self.kill()
     
+    def draw_extent(self):
+        """Particles spread out; they are culled one by one in draw()."""
+        return None
+    
+    def stamp(self):
+        return None
+    
     def draw(self, surface):
-        """Draw all particles."""
+        """Draw the particles that are visible and on screen."""
+        width, height = surface.get_size()
+        drawn = culled = 0
         for particle in self.particles:
+            if particle.alpha <= 0:
+                continue
+            reach = particle.size * 2 + 1  # glow is twice the core size
+            x, y = particle.position
+            if x < -reach or y < -reach or x > width + reach or y > height + reach:
+                culled += 1
+                continue
             particle.draw(surface)
+            drawn += 1
+        self.particles_drawn = drawn
+        self.particles_culled = culled
 
 
 def create_explosion(x, y, radius=30):
@@ -0,0 +1,190 @@
+"""
+Garbage collection paced by the frame loop.
+
+Every frame allocates plenty of short-lived objects (vectors, lists,
+surfaces), and CPython's cyclic collector runs whenever its allocation
+counter trips, which is as likely to be mid-frame as not. During
+gameplay GCManager takes that decision over:
+
+- begin_play() collects once and gc.freeze()s what survives (modules,
+  caches, the starfield), so later collections never walk it again, then
+  turns automatic collection off;
+- schedule() queues a collection on the frame scheduler whenever enough
+  new objects have piled up, so it runs in frame slack. Older generations
+  follow CPython's own pacing: one of them every GC_YOUNG_PER_OLDER
+  collections of the generation below;
+- end_play() turns automatic collection back on.
+
+It also measures, per frame:
+
+- every collection's pause (through gc.callbacks);
+- objects: growth of gc.get_count()[0], carried across collections
+  that reset it. That is GC-tracked objects allocated minus those freed,
+  the pressure that trips a collection, so it misses churn;
+- peak_kb: how far traced memory rose above where the frame started,
+  which is where short-lived churn shows up (CPython keeps no gross
+  allocation count, so this comes from tracemalloc; tracing slows
+  everything down, so only while stats are printed);
+- retained_blocks: the net change in allocated memory blocks, i.e. what
+  the frame kept rather than what it allocated.
+
+A `gc` event summarising them is logged every GC_REPORT_INTERVAL seconds:
+
+    ASTEROIDS_GC_STATS=1 python main.py   # also print the summaries
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from constants import GC_MANAGED, GC_YOUNG_THRESHOLD, GC_YOUNG_PER_OLDER, GC_REPORT_INTERVAL
+from logger import log_event
+from scheduler import PRIORITY_LOW
+
+
+class GCManager:
+    """Automatic GC off during play, collections in frame slack, pause stats."""
+
+    def __init__(self, managed=GC_MANAGED, report_interval=GC_REPORT_INTERVAL):
+        self.managed = managed
+        self.report_interval = report_interval
+        self.playing = False
+        self.print_stats = os.environ.get("ASTEROIDS_GC_STATS") == "1"
+        self.trace = self.print_stats and not tracemalloc.is_tracing()
+        if self.trace:
+            tracemalloc.start()
+
+        self._pause_start = None
+        self._frame_pauses = []  # seconds, collections finished this frame
+        self._frame_blocks = sys.getallocatedblocks()
+        self._frame_objects = 0  # counted before collections reset the count
+        self._young_mark = gc.get_count()[0]
+        self._frame_traced = tracemalloc.get_traced_memory()[0] if self.trace else 0
+        self._window = self._empty_window()
+        self._window_start = time.perf_counter()
+        gc.callbacks.append(self._on_gc)
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.trace:
+            tracemalloc.stop()
+            self.trace = False
+        if self.playing:
+            self.end_play()
+
+    # -- pacing --
+
+    def begin_play(self):
+        """Freeze what has survived until now and stop automatic collection."""
+        if not self.managed:
+            return
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.playing = True
+
+    def end_play(self):
+        """Back to automatic collection (the frozen objects stay frozen)."""
+        if not self.managed or not self.playing:
+            return
+        gc.enable()
+        self.playing = False
+
+    def schedule(self, scheduler):
+        """Queue a collection if enough objects have piled up since the last one."""
+        if not self.playing:
+            return
+        # Allocations since the last young collection, then how many
+        # collections each older generation has seen of the one below
+        young, middle, old = gc.get_count()
+        if young < GC_YOUNG_THRESHOLD:
+            return
+        generation = 0
+        if middle >= GC_YOUNG_PER_OLDER:
+            generation = 2 if old >= GC_YOUNG_PER_OLDER else 1
+        # One name per generation: each gets its own cost estimate
+        scheduler.defer(lambda: gc.collect(generation), PRIORITY_LOW, name=f"gc{generation}")
+
+    # -- measurement --
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._pause_start = time.perf_counter()
+            self._frame_objects += gc.get_count()[0] - self._young_mark
+        elif self._pause_start is not None:
+            self._frame_pauses.append(time.perf_counter() - self._pause_start)
+            self._pause_start = None
+            self._young_mark = gc.get_count()[0]
+
+    @staticmethod
+    def _empty_window():
+        return {"frames": 0, "collections": 0, "pause_total": 0.0, "pause_max": 0.0,
+                "objects_total": 0, "objects_max": 0, "peak_total": 0, "peak_max": 0,
+                "blocks_total": 0, "blocks_max": 0, "pending_max": 0}
+
+    def end_frame(self):
+        """Close this frame's tallies; call once per frame after the scheduler."""
+        young = gc.get_count()[0]
+        objects = self._frame_objects + young - self._young_mark
+        self._frame_objects = 0
+        self._young_mark = young
+
+        peak = 0
+        if self.trace:
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            peak = max(0, traced_peak - self._frame_traced)
+            tracemalloc.reset_peak()
+            self._frame_traced = traced
+
+        blocks = sys.getallocatedblocks()
+        retained = blocks - self._frame_blocks
+        self._frame_blocks = blocks
+        pauses, self._frame_pauses = self._frame_pauses, []
+
+        window = self._window
+        window["frames"] += 1
+        window["collections"] += len(pauses)
+        window["pause_total"] += sum(pauses)
+        window["pause_max"] = max([window["pause_max"], *pauses])
+        window["objects_total"] += objects
+        window["objects_max"] = max(window["objects_max"], objects)
+        window["peak_total"] += peak
+        window["peak_max"] = max(window["peak_max"], peak)
+        window["blocks_total"] += retained
+        window["blocks_max"] = max(window["blocks_max"], retained)
+        window["pending_max"] = max(window["pending_max"], young)
+
+        now = time.perf_counter()
+        if now - self._window_start >= self.report_interval:
+            report = self.report()
+            log_event("gc", **report)
+            if self.print_stats:
+                print("GC: " + ", ".join(f"{key} {value}" for key, value in report.items()))
+            self._window = self._empty_window()
+            self._window_start = now
+
+    def report(self):
+        """Summary of the frames since the last report."""
+        window = self._window
+        frames = max(1, window["frames"])
+        report = {
+            "frames": window["frames"],
+            "playing": self.playing,
+            "collections": window["collections"],
+            "pause_ms_total": round(window["pause_total"] * 1000, 3),
+            "pause_ms_max": round(window["pause_max"] * 1000, 3),
+            "objects_per_frame": round(window["objects_total"] / frames, 1),
+            "objects_per_frame_max": window["objects_max"],
+        }
+        if self.trace:
+            report["peak_kb_per_frame"] = round(window["peak_total"] / frames / 1024, 1)
+            report["peak_kb_per_frame_max"] = round(window["peak_max"] / 1024, 1)
+        report.update({
+            "retained_blocks_per_frame": round(window["blocks_total"] / frames, 1),
+            "retained_blocks_per_frame_max": window["blocks_max"],
+            "pending_objects_max": window["pending_max"],
+            "frozen": gc.get_freeze_count(),
+        })
+        return report
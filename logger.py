@@ -1,22 +1,266 @@
+import atexit
+import bz2
+import gzip
 import inspect
 import json
+import lzma
 import math
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
-__all__ = ["log_state", "log_event"]
+__all__ = [
+    "log_state", "log_event", "set_enabled", "configure", "log_path",
+    "flush_logs", "close_logs",
+]
 
 _FPS = 60
 _MAX_SECONDS = 16
 _SPRITE_SAMPLE_LIMIT = 10  # Maximum number of sprites to log per group
 
 _frame_count = 0
-_state_log_initialized = False
-_event_log_initialized = False
 _start_time = datetime.now()
-
-
-def log_state():
-    global _frame_count, _state_log_initialized
+_enabled = True
+
+# Codecs for rotated segments: name -> (file extension, opener)
+_COMPRESSORS = {
+    "gzip": (".gz", gzip.open),
+    "bz2": (".bz2", bz2.open),
+    "xz": (".xz", lzma.open),
+}
+try:
+    from compression import zstd  # Python 3.14+
+    _COMPRESSORS["zstd"] = (".zst", zstd.open)
+except ImportError:
+    pass
+
+# Output settings; environment variables give defaults without code changes
+_settings = {
+    "output_dir": os.environ.get("ASTEROIDS_LOG_DIR", "."),
+    "session_dirs": os.environ.get("ASTEROIDS_LOG_SESSION_DIRS", "") == "1",
+    "max_bytes": int(os.environ.get("ASTEROIDS_LOG_MAX_BYTES", 0)),  # 0 = no size rotation
+    "max_seconds": float(os.environ.get("ASTEROIDS_LOG_MAX_SECONDS", 0)),  # 0 = no time rotation
+    "backup_count": int(os.environ.get("ASTEROIDS_LOG_BACKUPS", 0)),  # 0 = keep every segment
+    "compress": os.environ.get("ASTEROIDS_LOG_COMPRESS") or None,
+}
+_session_dir = None
+
+
+def _check_compress(compress):
+    if compress is not None and compress not in _COMPRESSORS:
+        raise ValueError(f"Unsupported compression: {compress}")
+
+
+# A bad ASTEROIDS_LOG_COMPRESS fails here, not later on the housekeeper thread
+_check_compress(_settings["compress"])
+
+
+def set_enabled(enabled):
+    """Turn all file logging on or off (headless workers run with it off)."""
+    global _enabled
+    _enabled = enabled
+
+
+def configure(**settings):
+    """
+    Change where and how logs are written. Accepts any of:
+      output_dir    base directory for log files
+      session_dirs  write each run into its own timestamped subdirectory
+      max_bytes     rotate a log once it reaches this size
+      max_seconds   rotate a log after it has been open this long
+      backup_count  keep at most this many rotated segments per log
+      compress      "gzip", "bz2", "xz" (or "zstd" where available) for segments
+    Open logs are closed, so the next write starts a fresh file.
+    """
+    global _session_dir
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown log settings: {', '.join(sorted(unknown))}")
+    _check_compress(settings.get("compress", _settings["compress"]))
+
+    close_logs()
+    _settings.update(settings)
+    _session_dir = None
+
+
+def log_path(filename):
+    """Path for a log artifact inside this run's output directory."""
+    global _session_dir
+    if _session_dir is None:
+        directory = _settings["output_dir"]
+        if _settings["session_dirs"]:
+            stamp = _start_time.strftime("%Y%m%d-%H%M%S")
+            directory = os.path.join(directory, f"session-{stamp}-{os.getpid()}")
+        os.makedirs(directory, exist_ok=True)
+        _session_dir = directory
+    return os.path.join(_session_dir, filename)
+
+
+class _Housekeeper:
+    """
+    Background thread that compresses and prunes rotated segments, in
+    rotation order, so the game loop never waits on it.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = None
+
+    def submit(self, job):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="log-housekeeper", daemon=True)
+            self.thread.start()
+        self.jobs.put(job)
+
+    def drain(self):
+        """Block until every submitted job has run."""
+        if self.thread is not None:
+            self.jobs.join()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                job()
+            except Exception:
+                pass  # a failed job must not take the game, or the jobs after it, down
+            finally:
+                self.jobs.task_done()
+
+
+_housekeeper = _Housekeeper()
+
+
+def _compress_file(path, compress):
+    """Compress `path` next to itself and remove the original."""
+    extension, opener = _COMPRESSORS[compress]
+    with open(path, "rb") as src, opener(path + extension, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+    return path + extension
+
+
+class _LogFile:
+    """
+    One JSONL log kept open between writes, with rotation by size or
+    age into numbered segments (name.0001.jsonl[.gz], ...).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.file = None
+        self.size = 0
+        self.opened_at = 0.0
+        self.segment = 0
+        self.segments = deque()  # rotated segment paths, oldest first
+        self.directory = None  # where segment numbering was last picked up
+
+    def write(self, line):
+        if self.file is not None and self._rotation_due(len(line)):
+            self._rotate()
+        if self.file is None:
+            # New log file on each run
+            self.file = open(log_path(f"{self.name}.jsonl"), "w")
+            self.size = 0
+            self.opened_at = time.monotonic()
+        self.file.write(line)
+        self.size += len(line)
+
+    def _rotation_due(self, incoming):
+        max_bytes = _settings["max_bytes"]
+        max_seconds = _settings["max_seconds"]
+        if max_bytes and self.size and self.size + incoming > max_bytes:
+            return True
+        return bool(max_seconds) and time.monotonic() - self.opened_at >= max_seconds
+
+    def _resume_segments(self, directory):
+        """
+        Number on from the segments earlier runs left in `directory`, and
+        count them towards backup_count, so a new run neither overwrites
+        nor outlives them.
+        """
+        extensions = "|".join(re.escape(extension) for extension, _ in _COMPRESSORS.values())
+        pattern = re.compile(rf"{re.escape(self.name)}\.(\d+)\.jsonl(?:{extensions})?")
+        found = []
+        for entry in os.listdir(directory):
+            match = pattern.fullmatch(entry)
+            if match:
+                found.append((int(match.group(1)), os.path.join(directory, entry)))
+        found.sort()
+        self.segments = deque(path for _, path in found)
+        self.segment = found[-1][0] if found else 0
+        self.directory = directory
+
+    def _rotate(self):
+        self.close()
+        active = log_path(f"{self.name}.jsonl")
+        if self.directory != os.path.dirname(active):
+            self._resume_segments(os.path.dirname(active))
+        self.segment += 1
+        rotated = log_path(f"{self.name}.{self.segment:04d}.jsonl")
+        os.replace(active, rotated)
+
+        compress = _settings["compress"]
+        backup_count = _settings["backup_count"]
+
+        def finish():
+            path = _compress_file(rotated, compress) if compress else rotated
+            self.segments.append(path)
+            while backup_count and len(self.segments) > backup_count:
+                try:
+                    os.remove(self.segments.popleft())
+                except FileNotFoundError:
+                    pass
+
+        if compress:
+            _housekeeper.submit(finish)
+        else:
+            finish()
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+_state_log = _LogFile("game_state")
+_event_log = _LogFile("game_events")
+
+
+def flush_logs():
+    """Push buffered log lines to disk."""
+    _state_log.flush()
+    _event_log.flush()
+
+
+def close_logs():
+    """Close open logs and wait for pending segment compression."""
+    _state_log.close()
+    _event_log.close()
+    _housekeeper.drain()
+
+
+atexit.register(close_logs)
+
+
+def log_state(local_vars=None):
+    """
+    Snapshot sprite groups to game_state.jsonl about once per second.
+    `local_vars` maps names to objects; defaults to the caller's locals.
+    """
+    global _frame_count
+
+    if not _enabled:
+        return
 
     # Stop logging after `_MAX_SECONDS` seconds
     if _frame_count > _FPS * _MAX_SECONDS:
@@ -29,15 +273,16 @@ def log_state():
 
     now = datetime.now()
 
-    frame = inspect.currentframe()
-    if frame is None:
-        return
+    if local_vars is None:
+        frame = inspect.currentframe()
+        if frame is None:
+            return
 
-    frame_back = frame.f_back
-    if frame_back is None:
-        return
+        frame_back = frame.f_back
+        if frame_back is None:
+            return
 
-    local_vars = frame_back.f_locals.copy()
+        local_vars = frame_back.f_locals.copy()
 
     screen_size = []
     game_state = {}
@@ -77,6 +322,12 @@ def log_state():
 
             game_state[key] = {"count": len(value), "sprites": sprites_data}
 
+        # Plain counters (e.g. World.render_stats) are copied as they are
+        if isinstance(value, dict) and value and all(
+            isinstance(v, (int, float)) for v in value.values()
+        ):
+            game_state[key] = dict(value)
+
         if len(game_state) == 0 and hasattr(value, "position"):
             sprite_info = {"type": value.__class__.__name__}
 
@@ -107,16 +358,12 @@ def log_state():
         **game_state,
     }
 
-    # New log file on each run
-    mode = "w" if not _state_log_initialized else "a"
-    with open("game_state.jsonl", mode) as f:
-        f.write(json.dumps(entry) + "\n")
-
-    _state_log_initialized = True
+    _state_log.write(json.dumps(entry) + "\n")
 
 
 def log_event(event_type, **details):
-    global _event_log_initialized
+    if not _enabled:
+        return
 
     now = datetime.now()
 
@@ -128,8 +375,4 @@ def log_event(event_type, **details):
         **details,
     }
 
-    mode = "w" if not _event_log_initialized else "a"
-    with open("game_events.jsonl", mode) as f:
-        f.write(json.dumps(event) + "\n")
-
-    _event_log_initialized = True
\ No newline at end of file
+    _event_log.write(json.dumps(event) + "\n")
\ No newline at end of file
@@ -2,33 +2,46 @@
 Asteroids - Enhanced Edition
 A classic arcade game with modern features.
 """
+import os
+import time
+
+# First, so startup timing covers the pygame import too
+from startup import StartupTimer, preload
+
 import pygame
 
 from constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    WEAPON_STANDARD, WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER,
-    POWERUP_SHIELD, POWERUP_SPEED, POWERUP_WEAPON,
-    BOMB_EXPLOSION_RADIUS,
+    POWERUP_SHIELD, POWERUP_SPEED,
+    FRAME_RATE, SCHEDULER_MARGIN_MS, LOG_FLUSH_INTERVAL,
 )
-from logger import log_state, log_event
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from explosion import Explosion, create_explosion
+from logger import log_state, log_path, log_event, flush_logs
 from background import Background
-from powerup import PowerUp, maybe_spawn_powerup
-from bomb import Bomb
+from stamps import font as get_font, text as fixed_text
+from warmup import Warmup, menu_tasks
+from scheduler import FrameScheduler, PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_IDLE
+from gcmanager import GCManager
+
+# Only needed once a game starts: imported on first use, and preloaded
+# in the background after the first frame (see startup.py)
+GAME_MODULES = ("world", "checkpoint", "capture")
+
+QUICKSAVE = "quicksave.ckpt"  # F5 saves, F9 loads (also from the menu)
+INPUT_RECORDING = "input_recording.jsonl"  # written with ASTEROIDS_RECORD_INPUT=1
 
 
 def draw_text_centered(screen, font, text, y_offset, color="white"):
     """Draw centered text on screen."""
-    surface = font.render(text, True, color)
+    blit_centered(screen, font.render(text, True, color), y_offset)
+
+
+def blit_centered(screen, surface, y_offset):
+    """Draw an already rendered line centered on screen."""
     rect = surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + y_offset))
     screen.blit(surface, rect)
 
 
-def draw_hud(screen, font, score, lives, player):
+def draw_hud(screen, font, score, lives, player, stats=None):
     """Draw the game HUD with score, lives, weapon, and power-ups."""
     y = 10
     
@@ -37,7 +50,7 @@ def draw_hud(screen, font, score, lives, player):
     screen.blit(score_surface, (10, y))
     
     # Lives (draw ship icons)
-    lives_text = font.render("Lives:", True, "white")
+    lives_text = fixed_text(36, "Lives:", "white")
     screen.blit(lives_text, (10, y + 30))
     for i in range(lives):
         # Mini ship triangle
@@ -45,6 +58,11 @@ def draw_hud(screen, font, score, lives, player):
         points = [(x, y + 35), (x - 8, y + 50), (x + 8, y + 50)]
         pygame.draw.polygon(screen, "white", points, 2)
     
+    # Kill counters from the stats engine
+    if stats is not None:
+        stats_text = font.render(f"Kills: {stats.kills}  Streak: {stats.streak}", True, (150, 150, 150))
+        screen.blit(stats_text, (10, y + 60))
+    
     # Current weapon (right side)
     weapon_name = player.weapon_manager.current_weapon.name
     weapon_color = player.weapon_manager.current_weapon.color
@@ -70,13 +88,35 @@ def draw_hud(screen, font, score, lives, player):
         screen.blit(speed_text, (SCREEN_WIDTH - 200, powerup_y))
     
     # Weapon switch hint (bottom)
-    hint_font = pygame.font.Font(None, 24)
-    hint_text = hint_font.render("1-4: Switch Weapons | B: Drop Bomb | WASD: Move | SPACE: Shoot", True, (100, 100, 100))
+    hint_text = fixed_text(24, "1-5: Switch Weapons | B: Drop Bomb | WASD: Move | SPACE: Shoot", (100, 100, 100))
     screen.blit(hint_text, (SCREEN_WIDTH // 2 - hint_text.get_width() // 2, SCREEN_HEIGHT - 25))
 
 
+def start_recording(world):
+    """
+    (capture, recorder) for a game that has just started, each None
+    unless its environment switch (ASTEROIDS_CAPTURE=1,
+    ASTEROIDS_RECORD_INPUT=1) is set. The recorder takes over the ship's
+    controller.
+    """
+    capture = recorder = None
+    if os.environ.get("ASTEROIDS_CAPTURE") == "1":
+        from capture import CaptureWriter
+        capture = CaptureWriter(log_path("game_state.cap"))
+    if os.environ.get("ASTEROIDS_RECORD_INPUT") == "1":
+        from controls import InputRecorder
+        recorder = world.player.controller = InputRecorder(world.player.controller)
+    return capture, recorder
+
+
 def main():
-    pygame.init()
+    timer = StartupTimer()
+    timer.mark("imports")
+
+    # Only what we use: no audio or joystick subsystems
+    pygame.display.init()
+    pygame.font.init()
+    timer.mark("pygame_init")
 
     clock = pygame.time.Clock()
     dt = 0
@@ -86,79 +126,91 @@ def main():
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Asteroids - Enhanced Edition")
+    timer.mark("display")
+
+    # Create background (not in groups, drawn first); nebulae after the first frame
+    background = Background(bake=False)
+    timer.mark("background")
 
-    # Create sprite groups
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    explosions = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-    bombs = pygame.sprite.Group()
-
-    # Set static containers for auto-grouping
-    Player.containers = (updatable, drawable)
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = (updatable,)
-    Shot.containers = (shots, updatable, drawable)
-    Explosion.containers = (explosions, updatable, drawable)
-    PowerUp.containers = (powerups, updatable, drawable)
-    Bomb.containers = (bombs, updatable, drawable)
-
-    # Create background (not in groups, drawn first)
-    background = Background()
-
-    score = 0
-    lives = 3
-    font = pygame.font.Font(None, 36)
-    title_font = pygame.font.Font(None, 72)
+    font = get_font(36)
+    timer.mark("fonts")
     game_state = "menu"  # menu, playing, game_over
-    player = None
-    asteroid_field = None
+    world = None
+    capture = None  # full-rate binary capture, enabled by ASTEROIDS_CAPTURE=1
+    recorder = None  # the ship's input, for simulate.py --replay; ASTEROIDS_RECORD_INPUT=1
+    frame = 0
+    # Deferred work, run in whatever is left of each frame after the flip
+    scheduler = FrameScheduler()
+    frame_time = 1 / FRAME_RATE
+    frame_start = time.perf_counter()
+    next_flush = frame_start + LOG_FLUSH_INTERVAL
+    # No automatic GC during play: collections run as scheduled jobs instead
+    gc_manager = GCManager()
+    warmup = None  # cache pre-rendering for menu frames, started after the first frame
 
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if capture:
+                    capture.close()
+                if recorder:
+                    recorder.save(log_path(INPUT_RECORDING))
+                if world is not None and not world.game_over:
+                    # Quit mid-game: game over has not dumped these yet
+                    world.stats.dump(log_path("game_stats.json"))
+                scheduler.cancel("warmup")
+                scheduler.drain()
+                gc_manager.close()
                 return
             
             if game_state == "menu":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                    from world import World
+                    # Warm-up builds throwaway sprites (which draw from random and
+                    # join groups), so it must not run during play
+                    scheduler.cancel("warmup")
+                    background.bake()  # whatever warm-up has not got to yet
+                    world = None  # the last game is garbage, not something to freeze
+                    gc_manager.begin_play()
+                    game_state = "playing"
+                    world = World()
+                    frame = 0
+                    capture, recorder = start_recording(world)
+                elif (event.type == pygame.KEYDOWN and event.key == pygame.K_F9
+                        and os.path.exists(log_path(QUICKSAVE))):
+                    # Resume the last quicksave straight from the menu
+                    from checkpoint import load_checkpoint
+                    scheduler.cancel("warmup")
+                    background.bake()
+                    world = None
+                    gc_manager.begin_play()
                     game_state = "playing"
-                    score = 0
-                    lives = 3
-                    
-                    # Reset all groups
-                    updatable.empty()
-                    drawable.empty()
-                    asteroids.empty()
-                    shots.empty()
-                    explosions.empty()
-                    powerups.empty()
-                    bombs.empty()
-                    
-                    # Create game objects
-                    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-                    asteroid_field = AsteroidField()
+                    world = load_checkpoint(log_path(QUICKSAVE))
+                    frame = 0
+                    capture, recorder = start_recording(world)
 
             elif game_state == "playing":
-                if event.type == pygame.KEYDOWN:
-                    # Weapon switching (1-4 keys)
-                    if event.key == pygame.K_1:
-                        player.switch_weapon(0)
-                    elif event.key == pygame.K_2:
-                        player.switch_weapon(1)
-                    elif event.key == pygame.K_3:
-                        player.switch_weapon(2)
-                    elif event.key == pygame.K_4:
-                        player.switch_weapon(3)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    from checkpoint import save_checkpoint
+                    save_checkpoint(world, log_path(QUICKSAVE))
+                elif (event.type == pygame.KEYDOWN and event.key == pygame.K_F9
+                        and os.path.exists(log_path(QUICKSAVE))):
+                    from checkpoint import load_checkpoint
+                    world = load_checkpoint(log_path(QUICKSAVE), world.player.controller)
+                else:
+                    # Weapon switching (1-5 keys) and other discrete input
+                    world.player.controller.handle_event(event)
 
             elif game_state == "game_over":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
                     game_state = "menu"
+                    if warmup is not None and not warmup.done:
+                        # Pick up where the last menu left off
+                        scheduler.defer(warmup.job(), PRIORITY_IDLE, name="warmup")
 
         # Update background with player position for parallax
-        if player:
-            background.update(dt, player.position)
+        if world:
+            background.update(dt, world.player.position)
         else:
             background.update(dt)
         
@@ -167,123 +219,81 @@ def main():
 
         if game_state == "menu":
             # Menu screen
-            draw_text_centered(screen, title_font, "ASTEROIDS", -80, (100, 200, 255))
-            draw_text_centered(screen, font, "Enhanced Edition", -30, (150, 150, 150))
-            draw_text_centered(screen, font, "Press ENTER to Start", 50)
+            blit_centered(screen, fixed_text(72, "ASTEROIDS", (100, 200, 255)), -80)
+            blit_centered(screen, fixed_text(36, "Enhanced Edition", (150, 150, 150)), -30)
+            blit_centered(screen, fixed_text(36, "Press ENTER to Start", "white"), 50)
             
             # Feature list
-            small_font = pygame.font.Font(None, 24)
             features = [
-                "• Multiple weapon types (1-4 to switch)",
+                "• Multiple weapon types (1-5 to switch)",
                 "• Collectible power-ups",
                 "• Droppable bombs (B key)",
                 "• Physics-based movement"
             ]
             for i, feature in enumerate(features):
-                text = small_font.render(feature, True, (120, 120, 120))
+                text = fixed_text(24, feature, (120, 120, 120))
                 screen.blit(text, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 + 100 + i * 25))
         
         elif game_state == "playing":
             # Update all game objects
-            updatable.update(dt)
-            
-            # Hold-to-shoot and hold-to-bomb (checked every frame)
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE]:
-                player.shoot()  # Weapon cooldown handles fire rate
-            if keys[pygame.K_b]:
-                player.drop_bomb()  # Inventory handles cooldown
-
-            # Check bomb explosions
-            for bomb in list(bombs):
-                if bomb.exploded:
-                    # Create explosion
-                    explosion = create_explosion(bomb.position.x, bomb.position.y, 
-                                                 BOMB_EXPLOSION_RADIUS // 2)
-                    explosions.add(explosion)
-                    log_event("Bomb exploded!")
-                    
-                    # Destroy asteroids in blast radius
-                    for asteroid in list(asteroids):
-                        if bomb.check_asteroid_in_blast(asteroid.position, asteroid.radius):
-                            pos_x, pos_y, radius = asteroid.split()
-                            score += 15  # Bonus for bomb kills
-                            # Create smaller explosion for each asteroid
-                            exp = create_explosion(pos_x, pos_y, radius)
-                            explosions.add(exp)
-                    
-                    bomb.kill()
-
-            # Player-asteroid collision
-            for asteroid in list(asteroids):
-                if player.is_shielded():
-                    # Shield destroys asteroids on contact
-                    if player.collides_with(asteroid):
-                        pos_x, pos_y, radius = asteroid.split()
-                        explosion = create_explosion(pos_x, pos_y, radius)
-                        explosions.add(explosion)
-                        score += 5
-                        log_event("Shield destroyed asteroid!")
-                elif player.invulnerable_timer <= 0 and player.collides_with(asteroid):
-                    log_event("Player hit!")
-                    lives -= 1
-                    
-                    # Create explosion at player
-                    explosion = create_explosion(player.position.x, player.position.y, 20)
-                    explosions.add(explosion)
-                    
-                    if lives <= 0:
-                        game_state = "game_over"
-                    else:
-                        player.reset(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-            
-            # Shot-asteroid collision
-            for asteroid in list(asteroids):
-                for shot in list(shots):
-                    if shot.collides_with(asteroid):
-                        log_event("Asteroid hit!")
-                        pos_x, pos_y, radius = asteroid.split()
-                        score += 10
-                        shot.kill()
-                        
-                        # Create explosion
-                        explosion = create_explosion(pos_x, pos_y, radius)
-                        explosions.add(explosion)
-                        
-                        # Maybe spawn power-up
-                        powerup = maybe_spawn_powerup(pos_x, pos_y)
-                        if powerup:
-                            powerups.add(powerup)
-            
-            # Player-powerup collision
-            for powerup in list(powerups):
-                if player.collides_with(powerup):
-                    log_event(f"Collected {powerup.name} power-up!")
-                    player.apply_powerup(powerup)
-                    powerup.kill()
-                    score += 25  # Bonus for collecting power-ups
-
-            # Draw all objects (in order: asteroids, shots, player, explosions, powerups)
-            for obj in drawable:
-                obj.draw(screen)
+            world.update(dt)
+            frame += 1
+            if capture:
+                capture.capture(world, frame, world.stats.time)
+            if world.game_over:
+                game_state = "game_over"
+                gc_manager.end_play()
+                scheduler.defer(lambda stats=world.stats: stats.dump(log_path("game_stats.json")),
+                                PRIORITY_NORMAL)
+                if recorder:
+                    scheduler.defer(lambda saved=recorder: saved.save(log_path(INPUT_RECORDING)),
+                                    PRIORITY_NORMAL)
+                    recorder = None
+                if capture:
+                    capture.close()
+                    capture = None
+
+            # Draw all objects, layer by layer (asteroids up to particles)
+            world.draw(screen)
             
-            # Draw HUD
-            draw_hud(screen, font, score, lives, player)
+            # Draw HUD (top layer)
+            draw_hud(screen, font, world.score, world.lives, world.player, world.stats)
             
-            log_state()
+            log_state({"screen": screen, **vars(world)})
 
         elif game_state == "game_over":
             # Keep drawing explosions during game over
-            for explosion in explosions:
+            for explosion in world.explosions:
                 explosion.update(dt)
                 explosion.draw(screen)
             
-            draw_text_centered(screen, title_font, "GAME OVER", -60, (255, 80, 80))
-            draw_text_centered(screen, font, f"Final Score: {score}", 0)
-            draw_text_centered(screen, font, "Press R to Restart", 60)
+            blit_centered(screen, fixed_text(72, "GAME OVER", (255, 80, 80)), -60)
+            draw_text_centered(screen, font, f"Final Score: {world.score}", 0)
+            blit_centered(screen, fixed_text(36, "Press R to Restart", "white"), 60)
 
         pygame.display.flip()
-        dt = clock.tick(60) / 1000
+        if timer is not None:
+            timer.mark("first_frame")
+            report = timer.report()
+            log_event("startup", **{f"{phase}_ms": ms for phase, ms in report.items()})
+            if os.environ.get("ASTEROIDS_STARTUP_TIMES") == "1":
+                print(f"Startup: {timer}")
+            timer = None
+            # Deferred setup, off the path to the first frame
+            preload(*GAME_MODULES)
+            warmup = Warmup(menu_tasks(background))
+            scheduler.defer(warmup.job(), PRIORITY_IDLE, name="warmup")
+
+        now = time.perf_counter()
+        if now >= next_flush:
+            scheduler.defer(flush_logs, PRIORITY_LOW, name="flush_logs")
+            next_flush = now + LOG_FLUSH_INTERVAL
+        gc_manager.schedule(scheduler)
+        scheduler.run(frame_time - (now - frame_start) - SCHEDULER_MARGIN_MS / 1000)
+        gc_manager.end_frame()
+
+        dt = clock.tick(FRAME_RATE) / 1000
+        frame_start = time.perf_counter()
 
 
 if __name__ == "__main__":
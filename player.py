@@ -7,12 +7,14 @@ from circleshape import CircleShape, polygon_collides_circle
 from constants import (
     PLAYER_RADIUS, LINE_WIDTH, PLAYER_TURN_SPEED, PLAYER_SPEED,
     PLAYER_ACCELERATION, PLAYER_FRICTION, PLAYER_ACCELERATION_BOOST,
-    SHIELD_RING_RADIUS, WEAPON_STANDARD, WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER,
-    SCREEN_WIDTH, SCREEN_HEIGHT, POWERUP_SPEED,
+    SHIELD_RING_RADIUS, WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER, WEAPON_HOMING, WEAPON_ORDER,
+    SCREEN_WIDTH, SCREEN_HEIGHT, POWERUP_SPEED, CULL_MARGIN, LAYER_PLAYER,
 )
 from weapons import WeaponManager
+from controls import KeyboardInput
 from bomb import BombInventory
 from powerup import PowerUpManager
+from stamps import stamps
 
 
 class Player(CircleShape):
@@ -21,8 +23,11 @@ class Player(CircleShape):
     Features weapon system, bombs, and power-up effects.
     """
     
-    def __init__(self, x, y):
+    _layer = LAYER_PLAYER
+    
+    def __init__(self, x, y, controller=None):
         super().__init__(x, y, PLAYER_RADIUS)
+        self.controller = controller or KeyboardInput()  # InputProvider
         self.rotation = 0  # in degrees
         self.invulnerable_timer = 0
         
@@ -44,6 +49,11 @@ class Player(CircleShape):
         c = self.position - forward * self.radius + right
         return [a, b, c]
     
+    @property
+    def hit_radius(self):
+        """Distance from the center to the triangle's rear corners, its farthest points."""
+        return self.radius * math.hypot(1, 1 / 1.5)
+    
     def collides_with(self, other):
         """
         Check collision using triangular hitbox.
@@ -92,6 +102,10 @@ class Player(CircleShape):
         cockpit_pos = self.position + pygame.Vector2(0, 1).rotate(self.rotation) * (self.radius * 0.3)
         pygame.draw.circle(screen, (100, 150, 255), (int(cockpit_pos.x), int(cockpit_pos.y)), 4)
     
+    def draw_extent(self):
+        """Shield glow reaches furthest; the exhaust flame stays inside it."""
+        return SHIELD_RING_RADIUS + 10 + CULL_MARGIN
+    
     def _draw_exhaust(self, screen, tri):
         """Draw engine exhaust flames."""
         self.thrust_flicker += 0.3
@@ -138,9 +152,8 @@ class Player(CircleShape):
         pulse = 0.8 + 0.2 * math.sin(shield_time * 5)
         radius = int(SHIELD_RING_RADIUS * pulse)
         
-        # Outer glow
-        glow_surf = pygame.Surface((radius * 2 + 20, radius * 2 + 20), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (100, 150, 255, 50), (radius + 10, radius + 10), radius + 5)
+        # Outer glow (one reusable surface per pulse radius)
+        glow_surf = self.shield_glow(radius)
         screen.blit(glow_surf, (self.position.x - radius - 10, self.position.y - radius - 10))
         
         # Shield ring
@@ -152,6 +165,17 @@ class Player(CircleShape):
                           (int(self.position.x), int(self.position.y)), 
                           radius, 2)
     
+    @staticmethod
+    def shield_glow(radius):
+        """The shield's outer glow at pulse `radius`, cached."""
+        return stamps.get(("shield_glow", radius), lambda: Player._render_shield_glow(radius))
+    
+    @staticmethod
+    def _render_shield_glow(radius):
+        glow_surf = pygame.Surface((radius * 2 + 20, radius * 2 + 20), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surf, (100, 150, 255, 50), (radius + 10, radius + 10), radius + 5)
+        return glow_surf
+    
     def move(self, dt, direction=1):
         """Apply acceleration in facing direction."""
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
@@ -165,20 +189,20 @@ class Player(CircleShape):
     
     def update(self, dt):
         """Update player state, handle input."""
-        keys = pygame.key.get_pressed()
+        controls = self.controller.poll(self, dt)
+        
+        if controls.weapon is not None:
+            self.switch_weapon(controls.weapon)
         
         # Rotation
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            self.rotation -= PLAYER_TURN_SPEED * dt
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            self.rotation += PLAYER_TURN_SPEED * dt
+        self.rotation += PLAYER_TURN_SPEED * dt * controls.turn
         
         # Thrust
         self.is_thrusting = False
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
+        if controls.thrust:
             self.move(dt)
             self.is_thrusting = True
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+        if controls.reverse:
             self.move(dt, -0.5)  # weaker reverse thrust
         
         # Update systems
@@ -194,6 +218,12 @@ class Player(CircleShape):
         self.velocity *= (1 - PLAYER_FRICTION * dt)
         self.position += self.velocity * dt
         self.wrap_screen()
+        
+        # Hold-to-shoot and hold-to-bomb
+        if controls.fire:
+            self.shoot()  # Weapon cooldown handles fire rate
+        if controls.bomb:
+            self.drop_bomb()  # Inventory handles cooldown
     
     def shoot(self):
         """Fire current weapon. Returns list of shot objects."""
@@ -208,11 +238,9 @@ class Player(CircleShape):
         )
     
     def switch_weapon(self, weapon_index):
-        """Switch to weapon by index (0-3)."""
-        # Map index to weapon type
-        weapon_types = [WEAPON_STANDARD, WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER]
-        if 0 <= weapon_index < len(weapon_types):
-            weapon_type = weapon_types[weapon_index]
+        """Switch to weapon by index into WEAPON_ORDER."""
+        if 0 <= weapon_index < len(WEAPON_ORDER):
+            weapon_type = WEAPON_ORDER[weapon_index]
             # Unlock and switch
             self.weapon_manager.unlock_weapon(weapon_type)
             # Find index in available weapons
@@ -229,7 +257,7 @@ class Player(CircleShape):
         if powerup.powerup_type == POWERUP_WEAPON:
             # Grant a random better weapon temporarily
             import random
-            weapon_type = random.choice([WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER])
+            weapon_type = random.choice([WEAPON_SPREAD, WEAPON_RAPID, WEAPON_LASER, WEAPON_HOMING])
             self.weapon_manager.set_temporary_weapon(weapon_type, powerup.duration)
     
     def is_shielded(self):
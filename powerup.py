@@ -5,6 +5,7 @@ import pygame
 import random
 import math
 from circleshape import CircleShape
+from stamps import stamps, phase_bucket, bucket_phase, font
 from constants import (
     POWERUP_RADIUS,
     POWERUP_FLOAT_SPEED,
@@ -15,6 +16,7 @@ from constants import (
     POWERUP_CONFIGS,
     POWERUP_SPAWN_CHANCE,
     LINE_WIDTH,
+    LAYER_ITEMS,
 )
 
 
@@ -24,6 +26,8 @@ class PowerUp(CircleShape):
     Floats with a bobbing animation and has a glowing effect.
     """
     
+    _layer = LAYER_ITEMS
+    
     def __init__(self, x, y, powerup_type):
         super().__init__(x, y, POWERUP_RADIUS)
         self.powerup_type = powerup_type
@@ -33,6 +37,16 @@ class PowerUp(CircleShape):
         self.glow_phase = 0
         self.lifetime = 15.0  # despawn after 15 seconds
     
+    def __getstate__(self):
+        # Config comes from POWERUP_CONFIGS; don't copy it into checkpoints
+        state = self.__dict__.copy()
+        del state["config"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.config = POWERUP_CONFIGS[self.powerup_type]
+    
     @property
     def color(self):
         return self.config["color"]
@@ -71,10 +85,25 @@ class PowerUp(CircleShape):
     
     def draw(self, surface):
         """Draw power-up with glow effect."""
-        x, y = int(self.position.x), int(self.position.y)
+        surface.blit(*self.stamp())
+    
+    def stamp(self):
+        """One cached surface per look: glow step and expiry blink."""
+        glow = phase_bucket(self.glow_phase)
+        blinking = self.lifetime < 3 and int(self.lifetime * 4) % 2 == 0
+        key = ("powerup", self.color, self.radius, self.icon, glow, blinking)
+        image = stamps.get(key, lambda: self._render_stamp(bucket_phase(glow), blinking))
+        half = image.get_width() // 2
+        return image, (int(self.position.x) - half, int(self.position.y) - half)
+    
+    def _render_stamp(self, glow_phase, blinking):
+        """Render glow, rings, fill and icon onto a transparent surface."""
+        half = self.radius + 9
+        surface = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        x = y = half
         
         # Pulsing glow
-        glow_intensity = 0.5 + 0.5 * math.sin(self.glow_phase)
+        glow_intensity = 0.5 + 0.5 * math.sin(glow_phase)
         glow_radius = int(self.radius + 8 * glow_intensity)
         
         # Outer glow
@@ -89,14 +118,15 @@ class PowerUp(CircleShape):
         pygame.draw.circle(surface, inner_color, (x, y), self.radius - LINE_WIDTH)
         
         # Draw icon
-        font = pygame.font.Font(None, 24)
-        text = font.render(self.icon, True, self.color)
+        text = font(24).render(self.icon, True, self.color)
         text_rect = text.get_rect(center=(x, y))
         surface.blit(text, text_rect)
         
         # Blinking when about to expire
-        if self.lifetime < 3 and int(self.lifetime * 4) % 2 == 0:
+        if blinking:
             pygame.draw.circle(surface, (255, 255, 255), (x, y), self.radius + 2, 1)
+        
+        return surface
 
 
 class PowerUpManager:
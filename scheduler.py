@@ -0,0 +1,166 @@
+"""
+Cooperative scheduler for work that can wait a frame or two.
+
+The game loop draws, flips, then has until the next frame is due before
+clock.tick() would sleep anyway. FrameScheduler spends that slack on
+deferred jobs (log flushes, cache warm-up, stats dumps), most urgent
+first, and leaves the rest for later frames instead of running late:
+
+    scheduler.defer(flush_logs, PRIORITY_LOW, name="flush_logs")
+    ...
+    scheduler.run(slack_seconds)  # once per frame, after the flip
+
+A job is a callable, run once, or a generator, run one step per next()
+until exhausted, so long work can be sliced across frames. Named jobs
+are coalesced: deferring a name that is already queued is a no-op; they
+can also be cancelled by name.
+
+Each job's step time is tracked, and a job is only started if that
+estimate fits in what is left of the budget. So that nothing waits
+forever behind busier work, a job queued for SCHEDULER_MAX_WAIT_FRAMES
+runs next frame regardless (one such job per frame).
+"""
+import time
+from collections import deque
+
+from constants import SCHEDULER_MAX_WAIT_FRAMES
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_IDLE = 3
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_IDLE)
+
+_COST_SMOOTHING = 0.25  # weight of the newest step in a job's cost estimate
+
+
+class _Job:
+    __slots__ = ("task", "priority", "name", "queued_at")
+
+    def __init__(self, task, priority, name, queued_at):
+        self.task = task
+        self.priority = priority
+        self.name = name
+        self.queued_at = queued_at
+
+    def step(self):
+        """Run one slice; True if the job has more to do."""
+        if hasattr(self.task, "__next__"):
+            try:
+                next(self.task)
+            except StopIteration:
+                return False
+            return True
+        self.task()
+        return False
+
+
+class FrameScheduler:
+    """Deferred jobs in priority queues, run within a per-frame time budget."""
+
+    def __init__(self, max_wait=SCHEDULER_MAX_WAIT_FRAMES):
+        self.max_wait = max_wait
+        self.queues = {priority: deque() for priority in PRIORITIES}
+        self.names = set()  # names of queued jobs, for coalescing
+        self.costs = {}  # {name: smoothed seconds per step}
+        self.frame = 0
+        self.steps = 0
+        self.forced = 0  # steps run past the budget to end a starvation
+        self.busy = 0.0  # seconds spent running jobs
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def defer(self, task, priority=PRIORITY_NORMAL, name=None):
+        """Queue `task`; returns False if a job with `name` is already queued."""
+        if name is not None:
+            if name in self.names:
+                return False
+            self.names.add(name)
+        self.queues[priority].append(_Job(task, priority, name, self.frame))
+        return True
+
+    def cancel(self, name):
+        """Drop the queued job called `name`, if any; returns whether there was one."""
+        if name not in self.names:
+            return False
+        for queue in self.queues.values():
+            for job in queue:
+                if job.name == name:
+                    queue.remove(job)
+                    break
+        self.names.discard(name)
+        return True
+
+    def run(self, budget):
+        """Run queued jobs for up to `budget` seconds; returns seconds spent."""
+        self.frame += 1
+        start = time.perf_counter()
+        deadline = start + budget
+
+        starved = self._starved()
+        if starved is not None:
+            self._step(starved)
+            self.forced += 1
+
+        while True:
+            job = self._next_fitting(deadline - time.perf_counter())
+            if job is None:
+                break
+            self._step(job)
+
+        spent = time.perf_counter() - start
+        self.busy += spent
+        return spent
+
+    def _starved(self):
+        """The longest-waiting job past max_wait frames, if any."""
+        oldest = None
+        for queue in self.queues.values():
+            if queue and self.frame - queue[0].queued_at >= self.max_wait:
+                if oldest is None or queue[0].queued_at < oldest.queued_at:
+                    oldest = queue[0]
+        return oldest
+
+    def _next_fitting(self, remaining):
+        """Most urgent queue head whose expected step fits in `remaining`."""
+        if remaining <= 0:
+            return None
+        for priority in PRIORITIES:
+            queue = self.queues[priority]
+            if queue and self.costs.get(queue[0].name, 0.0) <= remaining:
+                return queue[0]
+        return None
+
+    def _step(self, job):
+        queue = self.queues[job.priority]
+        queue.popleft()  # always the head: both pickers only look at heads
+        started = time.perf_counter()
+        more = job.step()
+        took = time.perf_counter() - started
+        self.steps += 1
+        if job.name is not None:
+            estimate = self.costs.get(job.name)
+            self.costs[job.name] = took if estimate is None else (
+                estimate + _COST_SMOOTHING * (took - estimate))
+        if more:
+            job.queued_at = self.frame  # back of the line, waiting afresh
+            queue.append(job)
+        elif job.name is not None:
+            self.names.discard(job.name)
+
+    def drain(self):
+        """Run everything queued to completion, ignoring budgets."""
+        while len(self):
+            for priority in PRIORITIES:
+                if self.queues[priority]:
+                    self._step(self.queues[priority][0])
+                    break
+
+    def report(self):
+        return {
+            "queued": len(self),
+            "steps": self.steps,
+            "forced": self.forced,
+            "busy_ms": round(self.busy * 1000, 2),
+        }
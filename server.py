@@ -0,0 +1,350 @@
+"""
+Authoritative game server over TCP, with a stub client for loopback tests.
+
+Each named session is a headless GameSession (its own world and RNG,
+see session.py) stepped at a fixed tick rate by its own asyncio task.
+Clients join a session, get a ship driven by the inputs they send, and
+receive a world snapshot every tick. Snapshots are
+binary deltas (see snapshot.py) against the last one that client
+acknowledged, so a quiet field costs little bandwidth.
+
+Messages are framed as: payload length (u32), message type (u8), payload.
+A client that sends a frame longer than MAX_MESSAGE, or one that does
+not parse, is dropped.
+
+    python server.py serve --port 7777 --tick-rate 30
+    python server.py loopback --sessions 4 --clients 2 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import struct
+import sys
+import time
+
+import logger
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from controls import Controls, RemoteInput
+from session import GameSession
+from snapshot import SnapshotDecoder, SnapshotEncoder
+
+FRAME = struct.Struct("!IB")
+
+# Message types
+MSG_JOIN = 1  # client -> server: {"session", "name"}
+MSG_WELCOME = 2  # server -> client: {"client", "session", "tick_rate"}
+MSG_INPUT = 3  # client -> server: Controls.to_dict()
+MSG_SNAPSHOT = 4  # server -> client: SNAPSHOT_META + binary delta snapshot
+MSG_ACK = 5  # client -> server: ACK
+
+# Snapshot message: this header, then a snapshot.SnapshotEncoder payload
+SNAPSHOT_META = struct.Struct("!IhI")  # score, lives, the client's ship entity ID (0 = none)
+ACK = struct.Struct("!I")  # tick of the last snapshot decoded
+SNAPSHOT_GROUPS = ("asteroids", "shots", "powerups", "bombs")
+
+# Drop a client whose unsent data grows past this (it can't keep up)
+MAX_WRITE_BUFFER = 1 << 20
+# Longest payload accepted; a full snapshot of a crowded field is a few KB
+MAX_MESSAGE = 1 << 16
+
+
+async def read_message(reader):
+    """(type, payload bytes) of the next framed message; ValueError if it is too long."""
+    length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if length > MAX_MESSAGE:
+        raise ValueError(f"message of {length} bytes exceeds MAX_MESSAGE")
+    return kind, await reader.readexactly(length)
+
+
+def write_message(writer, kind, payload):
+    writer.write(FRAME.pack(len(payload), kind) + payload)
+
+
+def _json(data):
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class Client:
+    """One connected player on the server side."""
+
+    def __init__(self, client_id, name, writer, player):
+        self.id = client_id
+        self.name = name
+        self.writer = writer
+        self.player = player
+        self.input = player.controller
+        self.acked = None  # newest snapshot tick the client confirmed
+
+
+class Session:
+    """A named GameSession and the clients playing in it."""
+
+    def __init__(self, name, tick_rate, lives):
+        self.name = name
+        self.tick_rate = tick_rate
+        self.lives = lives
+        self.clients = {}
+        self.tick = 0
+        self.step_time = 0.0  # seconds spent in step(), for load reports
+        self.encoder = SnapshotEncoder(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.task = None
+        self.game = GameSession(lives=lives, players=0)
+
+    @property
+    def world(self):
+        return self.game.world
+
+    def join(self, client_id, name, writer):
+        player = self.game.add_player(RemoteInput())
+        client = self.clients[client_id] = Client(client_id, name, writer, player)
+        return client
+
+    def leave(self, client):
+        self.clients.pop(client.id, None)
+        if client.player in self.world.players:
+            self.game.remove_player(client.player)
+
+    def step(self):
+        """Advance one tick; a finished round restarts with the same clients."""
+        start = time.perf_counter()
+        self.game.step(1 / self.tick_rate)
+        self.tick += 1
+        if self.game.game_over:
+            self.game = GameSession(lives=self.lives, players=0)
+            self.encoder = SnapshotEncoder(SCREEN_WIDTH, SCREEN_HEIGHT)
+            for client in self.clients.values():
+                client.player = self.game.add_player(client.input)
+                client.acked = None
+        self.step_time += time.perf_counter() - start
+
+    def broadcast(self):
+        """Send each client a snapshot against its acked baseline; returns clients that fell behind."""
+        world = self.world
+        sprites = list(world.players)
+        for name in SNAPSHOT_GROUPS:
+            sprites.extend(getattr(world, name))
+        self.encoder.capture(self.tick, sprites)
+        ids = self.encoder.ids
+
+        lagging = []
+        for client in self.clients.values():
+            if client.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                lagging.append(client)
+                continue
+            meta = SNAPSHOT_META.pack(world.score, world.lives, ids.get(client.player, 0))
+            write_message(client.writer, MSG_SNAPSHOT, meta + self.encoder.encode(self.tick, client.acked))
+        return lagging
+
+
+class GameServer:
+    """Hosts any number of sessions in one event loop."""
+
+    def __init__(self, tick_rate=30, lives=3):
+        self.tick_rate = tick_rate
+        self.lives = lives
+        self.sessions = {}
+        self.next_client = 1
+        self.server = None
+        self.ticks = 0  # totals over sessions that have ended
+        self.step_time = 0.0
+
+    async def start(self, host="127.0.0.1", port=7777):
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for session in list(self.sessions.values()):
+            if session.task is not None:
+                session.task.cancel()
+
+    async def _handle_client(self, reader, writer):
+        client = session = None
+        try:
+            kind, payload = await read_message(reader)
+            if kind != MSG_JOIN:
+                return
+            request = json.loads(payload)
+            if not isinstance(request, dict):
+                raise TypeError("join request must be an object")
+            name = request.get("session", "default")
+            session = self.sessions.get(name)
+            if session is None:
+                session = self.sessions[name] = Session(name, self.tick_rate, self.lives)
+                session.task = asyncio.create_task(self._run_session(session))
+
+            client_id = self.next_client
+            self.next_client += 1
+            client = session.join(client_id, request.get("name", f"player{client_id}"), writer)
+            write_message(writer, MSG_WELCOME, _json({
+                "client": client_id, "session": name, "tick_rate": self.tick_rate,
+            }))
+
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MSG_INPUT:
+                    client.input.push(Controls.from_dict(json.loads(payload)))
+                elif kind == MSG_ACK:
+                    client.acked = ACK.unpack(payload)[0]
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # client went away
+        except (ValueError, TypeError, KeyError, struct.error) as error:
+            # Protocol error: oversized frame, bad JSON, bad fields or a
+            # short ACK. Drop the client rather than the server.
+            logger.log_event("client_dropped", client=client.id if client else None, reason=repr(error))
+        finally:
+            if client is not None:
+                session.leave(client)
+            writer.close()
+
+    async def _run_session(self, session):
+        """Fixed-rate tick loop; ends (and drops the session) once it is empty."""
+        loop = asyncio.get_running_loop()
+        period = 1 / session.tick_rate
+        next_tick = loop.time()
+        try:
+            while session.clients:
+                session.step()
+                for client in session.broadcast():
+                    client.writer.close()  # its handler cleans up
+                next_tick += period
+                delay = next_tick - loop.time()
+                if delay < 0:
+                    next_tick = loop.time()  # fell behind: don't try to catch up
+                    delay = 0
+                await asyncio.sleep(delay)
+        finally:
+            self.ticks += session.tick
+            self.step_time += session.step_time
+            if self.sessions.get(session.name) is session:
+                del self.sessions[session.name]
+
+    def load(self):
+        """Ticks run and mean milliseconds per tick, across all sessions so far."""
+        ticks = self.ticks + sum(session.tick for session in self.sessions.values())
+        step_time = self.step_time + sum(session.step_time for session in self.sessions.values())
+        return {"ticks": ticks, "step_ms_mean": round(step_time * 1000 / max(1, ticks), 3)}
+
+
+class StubClient:
+    """
+    Minimal client for loopback tests: joins a session, sends random
+    inputs, and mirrors the world from delta snapshots, acking each one.
+    """
+
+    def __init__(self, session="default", name=None, seed=0):
+        self.session = session
+        self.name = name
+        self.random = random.Random(seed)
+        self.decoder = SnapshotDecoder()
+        self.entities = {}  # {entity id: quantized row}, see snapshot.dequantize
+        self.score = 0
+        self.snapshots = 0
+        self.bytes = 0
+        self.tick = 0
+        self.client_id = None
+
+    async def run(self, host, port, seconds, input_rate=15):
+        reader, writer = await asyncio.open_connection(host, port)
+        write_message(writer, MSG_JOIN, _json({"session": self.session, "name": self.name}))
+        kind, payload = await read_message(reader)
+        self.client_id = json.loads(payload)["client"]
+
+        sender = asyncio.create_task(self._send_inputs(writer, input_rate))
+        try:
+            await asyncio.wait_for(self._receive(reader, writer), seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            sender.cancel()
+            writer.close()
+        return self.report()
+
+    async def _send_inputs(self, writer, rate):
+        while True:
+            controls = Controls(
+                thrust=self.random.random() < 0.3,
+                turn=self.random.uniform(-1, 1),
+                fire=True,
+                bomb=self.random.random() < 0.01,
+            )
+            write_message(writer, MSG_INPUT, _json(controls.to_dict()))
+            await writer.drain()
+            await asyncio.sleep(1 / rate)
+
+    async def _receive(self, reader, writer):
+        while True:
+            kind, payload = await read_message(reader)
+            if kind != MSG_SNAPSHOT:
+                continue
+            self.snapshots += 1
+            self.bytes += FRAME.size + len(payload)
+            self.score, _, _ = SNAPSHOT_META.unpack_from(payload)
+            self.tick, self.entities = self.decoder.decode(payload[SNAPSHOT_META.size:])
+            write_message(writer, MSG_ACK, ACK.pack(self.tick))
+
+    def report(self):
+        return {
+            "client": self.client_id,
+            "session": self.session,
+            "snapshots": self.snapshots,
+            "last_tick": self.tick,
+            "score": self.score,
+            "entities": len(self.entities),
+            "bytes": self.bytes,
+            "bytes_per_snapshot": round(self.bytes / max(1, self.snapshots), 1),
+        }
+
+
+async def _loopback(sessions, clients, seconds, tick_rate):
+    server = GameServer(tick_rate)
+    port = await server.start("127.0.0.1", 0)
+    stubs = [
+        StubClient(f"session-{s}", f"bot-{s}-{c}", seed=s * 1000 + c)
+        for s in range(sessions) for c in range(clients)
+    ]
+    results = await asyncio.gather(*(stub.run("127.0.0.1", port, seconds) for stub in stubs))
+    await server.close()
+    return {"sessions": sessions, "server": server.load(), "clients": results}
+
+
+async def _serve(host, port, tick_rate, lives):
+    server = GameServer(tick_rate, lives)
+    port = await server.start(host, port)
+    print(f"Serving on {host}:{port} at {tick_rate} ticks/s", file=sys.stderr)
+    await server.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless authoritative game server.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="accept clients until interrupted")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=7777)
+    serve.add_argument("--lives", type=int, default=3)
+    loopback = sub.add_parser("loopback", help="server plus stub clients over localhost")
+    loopback.add_argument("--sessions", type=int, default=2)
+    loopback.add_argument("--clients", type=int, default=2, help="clients per session")
+    loopback.add_argument("--seconds", type=float, default=5.0)
+    for command in (serve, loopback):
+        command.add_argument("--tick-rate", type=int, default=30)
+        command.add_argument("--log", action="store_true", help="keep event/state logging on")
+    args = parser.parse_args(argv)
+
+    if not args.log:
+        logger.set_enabled(False)
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args.host, args.port, args.tick_rate, args.lives))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(_loopback(args.sessions, args.clients, args.seconds, args.tick_rate))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
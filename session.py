@@ -0,0 +1,188 @@
+"""
+Independent game sessions sharing one process.
+
+Entity classes find their groups through static `containers` and draw
+from the global `random` module, so by itself a World assumes it is the
+only game running. A GameSession owns a World plus its own RNG stream
+and swaps both in around everything it does, so any number of sessions
+can be stepped in any interleaving and each plays exactly as it would
+alone with the same seed.
+
+SessionHost steps many sessions round-robin. For more than one core,
+run_sharded() splits sessions across a process pool, each worker
+hosting its shard round-robin (threads would not help: stepping holds
+the GIL and the containers are process-wide).
+
+    python session.py --sessions 200 --duration 30 --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+import logger
+from asteroidfield import AsteroidField
+from controls import BotInput
+from world import World
+
+SESSION_DT = 1 / 60
+
+
+class GameSession:
+    """
+    One game: a World and the RNG state it draws from. Everything that
+    touches the world (stepping, joining ships) goes through active().
+    """
+
+    def __init__(self, seed=None, lives=3, controller=None, players=1):
+        self.seed = seed
+        self.rng_state = random.Random(seed).getstate()
+        self.frames = 0
+        self.time = 0.0
+        self.world = None
+        with self.active():
+            if players:
+                self.world = World(lives=lives, controller=controller)
+                for _ in range(players - 1):
+                    self.world.add_player()
+            else:
+                self.world = World(lives=lives, populate=False)
+                self.world.asteroid_field = AsteroidField()
+
+    @contextmanager
+    def active(self):
+        """Make this session's groups and RNG the process-wide ones for a while."""
+        saved = random.getstate()
+        random.setstate(self.rng_state)
+        if self.world is not None:
+            self.world.activate()
+        try:
+            yield
+        finally:
+            self.rng_state = random.getstate()
+            random.setstate(saved)
+
+    @property
+    def score(self):
+        return self.world.score
+
+    @property
+    def game_over(self):
+        return self.world.game_over
+
+    def add_player(self, controller=None):
+        with self.active():
+            return self.world.add_player(controller)
+
+    def remove_player(self, player):
+        with self.active():
+            self.world.remove_player(player)
+
+    def step(self, dt=SESSION_DT):
+        with self.active():
+            self.world.update(dt)
+        self.frames += 1
+        self.time += dt
+
+
+class SessionHost:
+    """Steps a set of sessions round-robin, one frame each per pass."""
+
+    def __init__(self, sessions=()):
+        self.sessions = list(sessions)
+
+    def add(self, session):
+        self.sessions.append(session)
+        return session
+
+    def remove(self, session):
+        self.sessions.remove(session)
+
+    def step(self, dt=SESSION_DT):
+        """Advance every running session by `dt`; returns how many stepped."""
+        stepped = 0
+        for session in self.sessions:
+            if not session.game_over:
+                session.step(dt)
+                stepped += 1
+        return stepped
+
+    def run(self, duration, dt=SESSION_DT):
+        """Step until every session is over or has played `duration` seconds."""
+        for _ in range(round(duration / dt)):
+            if not self.step(dt):
+                break
+
+
+def bot_session(seed, lives=3):
+    """A single-ship session flown by BotInput."""
+    session = GameSession(seed, lives)
+    session.world.player.controller = BotInput(session.world.asteroids)
+    return session
+
+
+def _session_result(session):
+    return {
+        "seed": session.seed,
+        "frames": session.frames,
+        "time_s": round(session.time, 3),
+        "score": session.score,
+        "game_over": session.game_over,
+    }
+
+
+def _run_shard(job):
+    """Pool worker: host a shard of bot sessions round-robin."""
+    seeds, duration, lives = job
+    host = SessionHost(bot_session(seed, lives) for seed in seeds)
+    host.run(duration)
+    return [_session_result(session) for session in host.sessions]
+
+
+def run_sharded(seeds, duration, workers=None, lives=3):
+    """Play a bot session per seed, spread over `workers` processes."""
+    workers = workers or os.cpu_count()
+    shards = [(seeds[i::workers], duration, lives) for i in range(workers) if seeds[i::workers]]
+    if len(shards) == 1:
+        return _run_shard(shards[0])
+    with multiprocessing.Pool(len(shards), initializer=logger.set_enabled, initargs=(False,)) as pool:
+        results = [result for shard in pool.map(_run_shard, shards) for result in shard]
+    return sorted(results, key=lambda result: result["seed"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many headless bot sessions at once.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0, help="sim seconds per session")
+    parser.add_argument("--lives", type=int, default=3)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to shard sessions over (1 = round-robin here)")
+    args = parser.parse_args(argv)
+
+    logger.set_enabled(False)
+    seeds = list(range(args.first_seed, args.first_seed + args.sessions))
+    start = time.perf_counter()
+    results = run_sharded(seeds, args.duration, args.workers, args.lives)
+    wall = time.perf_counter() - start
+
+    frames = sum(result["frames"] for result in results)
+    print(f"{len(results)} sessions, {frames} frames in {wall:.2f}s", file=sys.stderr)
+    print(json.dumps({
+        "sessions": len(results),
+        "workers": args.workers,
+        "wall_time_s": round(wall, 3),
+        "frames": frames,
+        "frames_per_s": round(frames / wall, 1),
+        "realtime_sessions": round(frames * SESSION_DT / wall, 1),
+        "game_overs": sum(result["game_over"] for result in results),
+        "mean_score": round(sum(result["score"] for result in results) / max(1, len(results)), 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pygame
 from circleshape import CircleShape
-from constants import SHOT_RADIUS
+from constants import SHOT_RADIUS, LAYER_SHOTS
+from stamps import stamps
 
 
 class Shot(CircleShape):
@@ -9,6 +10,8 @@ class Shot(CircleShape):
     Supports different weapon types with varying colors, sizes, and damage.
     """
     
+    _layer = LAYER_SHOTS
+    
     def __init__(self, x, y, radius=SHOT_RADIUS, color=(255, 255, 100), damage=1):
         super().__init__(x, y, radius)
         self.color = color
@@ -17,7 +20,22 @@ class Shot(CircleShape):
     
     def draw(self, surface):
         """Draw shot with glow effect based on weapon type."""
-        x, y = int(self.position.x), int(self.position.y)
+        surface.blit(*self._stamp_at())
+    
+    def stamp(self):
+        return self._stamp_at()
+    
+    def _stamp_at(self):
+        """Shots of one weapon look identical, so they share one surface."""
+        stamp = stamps.get(("shot", self.color, self.radius), self._render_stamp)
+        half = stamp.get_width() // 2
+        return stamp, (int(self.position.x) - half, int(self.position.y) - half)
+    
+    def _render_stamp(self):
+        """Render the glow, core and center once onto a transparent surface."""
+        half = int(self.radius) + 2
+        surface = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        x = y = half
         
         # Outer glow
         glow_color = tuple(max(0, c - 100) for c in self.color)
@@ -31,6 +49,8 @@ class Shot(CircleShape):
         if self.radius >= 3:
             center_color = tuple(min(255, c + 50) for c in self.color)
             pygame.draw.circle(surface, center_color, (x, y), max(1, int(self.radius) - 1))
+        
+        return surface
     
     def update(self, dt):
         """Move shot and wrap around screen."""
@@ -40,4 +60,41 @@ class Shot(CircleShape):
         # Reduce lifetime
         self.lifetime -= dt
         if self.lifetime <= 0:
-            self.kill()
\ No newline at end of file
+            self.kill()
+
+
+class Missile(Shot):
+    """
+    Homing projectile that steers towards the nearest asteroid.
+    Targets come from `Missile.targets`, a spatially indexed group wired
+    up by World, so each missile's lookup only visits nearby cells.
+    """
+    
+    targets = None
+    
+    def __init__(self, x, y, radius, color, damage, turn_rate, lock_range):
+        super().__init__(x, y, radius, color, damage)
+        self.turn_rate = turn_rate
+        self.lock_range = lock_range
+    
+    def update(self, dt):
+        """Turn towards the nearest asteroid in range, then fly on."""
+        target = None
+        if self.targets is not None:
+            target, _ = self.targets.nearest(self.position, self.lock_range)
+        if target is not None:
+            angle = self.velocity.angle_to(target.position - self.position)
+            angle = (angle + 180) % 360 - 180
+            max_turn = self.turn_rate * dt
+            self.velocity.rotate_ip(max(-max_turn, min(max_turn, angle)))
+        super().update(dt)
+    
+    def draw(self, surface):
+        """Draw missile with a short exhaust trail."""
+        if self.velocity.length_squared() > 0:
+            tail = self.position - self.velocity.normalize() * self.radius * 3
+            pygame.draw.line(surface, (255, 230, 150), self.position, tail, 2)
+        super().draw(surface)
+    
+    def stamp(self):
+        return None  # the trail follows the heading, so draw() each frame
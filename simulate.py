@@ -0,0 +1,340 @@
+"""
+Headless batch simulator for balance and load sweeps.
+
+Runs many seeded games across a multiprocessing pool. Each run gets its own
+constants overrides, a BotInput pilot flies the ship, and the per-run
+results are aggregated into a single JSON report.
+
+Example:
+    python simulate.py --seeds 8 --duration 300 --workers 8 \\
+        --sweep ASTEROID_SPAWN_RATE_SECONDS=0.4,0.8 \\
+        --override 'WEAPON_CONFIGS={"2": {"cooldown": 0.05}}'
+"""
+import argparse
+import copy
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+import constants
+import logger
+from capture import CaptureWriter
+from checkpoint import load_checkpoint
+from controls import BotInput, RecordedInput
+from world import World
+
+SIM_DT = 1 / 60  # fixed timestep keeps seeded runs reproducible
+COUNTED_GROUPS = ("asteroids", "shots", "explosions", "powerups", "bombs")
+
+
+def _merge(base, override):
+    """Recursively merge `override` into a copy of `base` (dicts only)."""
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        # JSON object keys are strings; WEAPON_CONFIGS and friends use ints
+        if key not in merged and isinstance(key, str) and key.lstrip("-").isdigit():
+            key = int(key)
+        merged[key] = _merge(merged.get(key), value)
+    return merged
+
+
+@contextmanager
+def override_constants(overrides):
+    """
+    Temporarily replace values from constants.py.
+    Modules import constants by name, so every loaded module that bound the
+    original object is patched too. Derived constants are not recomputed.
+    """
+    patched = []
+    try:
+        for name, value in overrides.items():
+            if not hasattr(constants, name):
+                raise KeyError(f"Unknown constant: {name}")
+            original = getattr(constants, name)
+            new_value = _merge(original, value)
+            for module in list(sys.modules.values()):
+                if getattr(module, name, None) is original:
+                    setattr(module, name, new_value)
+                    patched.append((module, name, original))
+        yield
+    finally:
+        for module, name, original in reversed(patched):
+            setattr(module, name, original)
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _frame_time_summary(frame_times):
+    """Frame-time percentiles in milliseconds."""
+    ordered = sorted(frame_times)
+    return {
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+    }
+
+
+def run_simulation(spec):
+    """
+    Play one headless game and return its measurements.
+    `spec` holds seed, overrides, duration (sim seconds), lives, an
+    optional `replay` recording to fly instead of the bot, an optional
+    `capture` path for a full-rate binary state capture, and an optional
+    `checkpoint` to start from instead of an empty field (its lives win).
+    """
+    with override_constants(spec.get("overrides", {})):
+        if spec.get("checkpoint"):
+            world = load_checkpoint(spec["checkpoint"])
+        else:
+            world = World(lives=spec.get("lives", 3))
+        # Seed after loading so each seed branches differently from a checkpoint
+        random.seed(spec["seed"])
+        if spec.get("replay"):
+            world.player.controller = RecordedInput.load(spec["replay"], loop=True)
+        else:
+            world.player.controller = BotInput(world.asteroids)
+        capture = CaptureWriter(spec["capture"]) if spec.get("capture") else None
+
+        frame_times = []
+        totals = dict.fromkeys(COUNTED_GROUPS, 0)
+        peaks = dict.fromkeys(COUNTED_GROUPS, 0)
+        sim_time = 0.0
+        frames = 0
+        pressure_total = 0.0
+        pressure_peak = 0.0
+
+        while sim_time < spec["duration"] and not world.game_over:
+            start = time.perf_counter()
+            world.update(SIM_DT)
+            frame_times.append(time.perf_counter() - start)
+            if capture:
+                capture.capture(world, frames + 1, sim_time + SIM_DT)
+
+            for name in COUNTED_GROUPS:
+                count = len(getattr(world, name))
+                totals[name] += count
+                peaks[name] = max(peaks[name], count)
+            pressure = world.asteroid_field.pressure()["pressure"]
+            pressure_total += pressure
+            pressure_peak = max(pressure_peak, pressure)
+
+            sim_time += SIM_DT
+            frames += 1
+
+        if capture:
+            capture.close()
+
+    return {
+        "seed": spec["seed"],
+        "overrides": spec.get("overrides", {}),
+        "survival_s": round(sim_time, 3),
+        "died": world.game_over,
+        "score": world.score,
+        "frames": frames,
+        "stats": world.stats.to_dict(),
+        "entities": {
+            name: {"mean": round(totals[name] / max(1, frames), 2), "peak": peaks[name]}
+            for name in COUNTED_GROUPS
+        },
+        "population": {
+            "mean_pressure": round(pressure_total / max(1, frames), 3),
+            "peak_pressure": pressure_peak,
+            "throttled_spawns": world.asteroid_field.throttled,
+            "wave": world.asteroid_field.wave + 1,
+        },
+        "frame_time": _frame_time_summary(frame_times),
+        "frame_times": frame_times,
+    }
+
+
+def _init_worker():
+    """Prepare a pool process for headless play."""
+    logger.set_enabled(False)
+
+
+def build_specs(seeds, duration, sweep=None, overrides=None, lives=3, replay=None,
+                capture_dir=None, checkpoint=None):
+    """Cartesian product of sweep values, each played with every seed."""
+    sweep = sweep or {}
+    names = sorted(sweep)
+    specs = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        run_overrides = dict(overrides or {})
+        run_overrides.update(zip(names, values))
+        for seed in seeds:
+            specs.append({
+                "seed": seed,
+                "overrides": run_overrides,
+                "duration": duration,
+                "lives": lives,
+                "replay": replay,
+                "checkpoint": checkpoint,
+                "capture": capture_dir and os.path.join(
+                    capture_dir, f"run-{len(specs):04d}-seed{seed}.cap"),
+            })
+    return specs
+
+
+def run_batch(specs, workers=None):
+    """Run every spec across a process pool, yielding results as they finish."""
+    pool = multiprocessing.Pool(processes=workers, initializer=_init_worker)
+    try:
+        yield from pool.imap_unordered(run_simulation, specs)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def summarize(results):
+    """Aggregate run results per override set into one report."""
+    groups = {}
+    for result in results:
+        key = json.dumps(result["overrides"], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+
+    report = []
+    for key, runs in sorted(groups.items()):
+        all_frame_times = list(itertools.chain.from_iterable(r["frame_times"] for r in runs))
+        survival = [r["survival_s"] for r in runs]
+        scores = [r["score"] for r in runs]
+        kills = [r["stats"]["kills"] for r in runs]
+        report.append({
+            "overrides": json.loads(key),
+            "runs": len(runs),
+            "deaths": sum(r["died"] for r in runs),
+            "survival_s": {
+                "mean": round(statistics.fmean(survival), 3),
+                "min": min(survival),
+                "max": max(survival),
+            },
+            "score": {
+                "mean": round(statistics.fmean(scores), 2),
+                "min": min(scores),
+                "max": max(scores),
+            },
+            "kills": {
+                "mean": round(statistics.fmean(kills), 2),
+                "by_source": {
+                    source: sum(r["stats"]["kills_by_source"].get(source, 0) for r in runs)
+                    for source in runs[0]["stats"]["kills_by_source"]
+                },
+            },
+            "entities": {
+                name: {
+                    "mean": round(statistics.fmean(r["entities"][name]["mean"] for r in runs), 2),
+                    "peak": max(r["entities"][name]["peak"] for r in runs),
+                }
+                for name in COUNTED_GROUPS
+            },
+            "population": {
+                "mean_pressure": round(statistics.fmean(r["population"]["mean_pressure"] for r in runs), 3),
+                "peak_pressure": max(r["population"]["peak_pressure"] for r in runs),
+                "throttled_spawns": sum(r["population"]["throttled_spawns"] for r in runs),
+            },
+            "frame_time": _frame_time_summary(all_frame_times),
+            "seeds": sorted(r["seed"] for r in runs),
+        })
+    return report
+
+
+def _parse_value(text):
+    """Parse an override value as JSON, falling back to a plain string."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _parse_assignments(items, multi=False):
+    """Parse NAME=VALUE (or NAME=V1,V2,... when `multi`) arguments."""
+    parsed = {}
+    for item in items or []:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {item!r}")
+        if multi:
+            parsed[name] = [_parse_value(v) for v in value.split(",")]
+        else:
+            parsed[name] = _parse_value(value)
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=4, help="seeds per override set")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=120.0,
+                        help="max simulated seconds per run")
+    parser.add_argument("--lives", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool size (default: CPU count)")
+    parser.add_argument("--override", action="append", metavar="NAME=VALUE",
+                        help="constant override applied to every run (JSON value)")
+    parser.add_argument("--sweep", action="append", metavar="NAME=V1,V2",
+                        help="constant to sweep over; one override set per value")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="loop a recorded input stream instead of the bot")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="start every run from this saved world")
+    parser.add_argument("--capture-dir", metavar="DIR",
+                        help="write a binary state capture of every run here")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    specs = build_specs(
+        seeds, args.duration,
+        sweep=_parse_assignments(args.sweep, multi=True),
+        overrides=_parse_assignments(args.override),
+        lives=args.lives,
+        replay=args.replay,
+        capture_dir=args.capture_dir,
+        checkpoint=args.checkpoint,
+    )
+    if args.capture_dir:
+        os.makedirs(args.capture_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    for result in run_batch(specs, args.workers):
+        results.append(result)
+        print(f"[{len(results)}/{len(specs)}] seed={result['seed']} "
+              f"score={result['score']} survived={result['survival_s']}s",
+              file=sys.stderr)
+
+    report = {
+        "wall_time_s": round(time.perf_counter() - start, 3),
+        "workers": args.workers or os.cpu_count(),
+        "sim_dt": SIM_DT,
+        "results": summarize(results),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Delta-compressed binary world snapshots for streaming state.
+
+Every sprite gets a stable entity ID for as long as it lives, and its
+state is quantized to fixed point:
+
+    kind      u8
+    x, y      u16, 1/16 px (positions wrap into the field)
+    vx, vy    i16, 1/8 px/s (clamped)
+    rotation  u16, 1/65536 of a turn
+    radius    u16, 1/16 px
+
+A snapshot is encoded against a baseline: an earlier snapshot the
+receiver has acknowledged. Only entities with a changed quantized field
+are written, each with a bitmask of which fields follow, then the IDs
+of entities that are gone. With no usable baseline the snapshot is a
+full one, so a lost ack only costs bandwidth, never correctness.
+
+    header    tick (u32), baseline tick (u32, 0 = none),
+              changed count (u16), removed count (u16)
+    changed   id (varint), field mask (u8), the masked fields in order
+    removed   id (varint) each
+
+    python snapshot.py bench --seconds 30
+"""
+import argparse
+import json
+import random
+import struct
+import time
+from collections import OrderedDict
+
+from capture import KINDS, KIND_CODES  # one set of entity codes for capture and wire
+
+HEADER = struct.Struct("<IIHH")
+
+# (name, struct, scale) of each quantized field, in mask-bit order
+FIELDS = (
+    ("kind", struct.Struct("<B"), 1),
+    ("x", struct.Struct("<H"), 16),
+    ("y", struct.Struct("<H"), 16),
+    ("vx", struct.Struct("<h"), 8),
+    ("vy", struct.Struct("<h"), 8),
+    ("rotation", struct.Struct("<H"), 65536 / 360),
+    ("radius", struct.Struct("<H"), 16),
+)
+ALL_FIELDS = (1 << len(FIELDS)) - 1
+
+# Tables kept for use as baselines, on each side
+SNAPSHOT_HISTORY = 64
+
+_I16 = (-32768, 32767)
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def quantize(sprite, width, height):
+    """Fixed-point (kind, x, y, vx, vy, rotation, radius) of a sprite."""
+    position = sprite.position
+    velocity = sprite.velocity
+    low, high = _I16
+    return (
+        KIND_CODES.get(type(sprite).__name__, 255),
+        round((position.x % width) * 16),
+        round((position.y % height) * 16),
+        min(high, max(low, round(velocity.x * 8))),
+        min(high, max(low, round(velocity.y * 8))),
+        round((getattr(sprite, "rotation", 0.0) % 360) * 65536 / 360) & 0xFFFF,
+        min(0xFFFF, round(sprite.radius * 16)),
+    )
+
+
+def dequantize(row):
+    """A quantized row as a dict of floats (kind as its class name)."""
+    state = {name: value / scale for (name, _, scale), value in zip(FIELDS, row)}
+    state["kind"] = KINDS[row[0]] if row[0] < len(KINDS) else "?"
+    return state
+
+
+class SnapshotEncoder:
+    """
+    Sender side: assigns entity IDs, keeps recent quantized tables as
+    baselines, and encodes a tick against whichever baseline a receiver
+    last acknowledged.
+    """
+
+    def __init__(self, width, height, history=SNAPSHOT_HISTORY):
+        self.width = width
+        self.height = height
+        self.history = history
+        self.ids = {}  # {sprite: entity id}
+        self.next_id = 1
+        self.tables = OrderedDict()  # {tick: {entity id: row}}
+
+    def capture(self, tick, sprites):
+        """Quantize `sprites` as the state at `tick` (ticks must increase)."""
+        ids = {}
+        table = {}
+        for sprite in sprites:
+            entity = self.ids.get(sprite)
+            if entity is None:
+                entity = self.next_id
+                self.next_id += 1
+            ids[sprite] = entity
+            table[entity] = quantize(sprite, self.width, self.height)
+        self.ids = ids  # sprites that are gone lose their IDs
+        self.tables[tick] = table
+        while len(self.tables) > self.history:
+            self.tables.popitem(last=False)
+        return table
+
+    def encode(self, tick, baseline=None):
+        """Bytes of the snapshot at `tick`, relative to `baseline` if still held."""
+        table = self.tables[tick]
+        base = self.tables.get(baseline) if baseline else None
+        if base is None:
+            baseline, base = 0, {}
+
+        body = bytearray()
+        changed = 0
+        for entity, row in table.items():
+            old = base.get(entity)
+            if old == row:
+                continue
+            if old is None:
+                mask = ALL_FIELDS
+            else:
+                mask = 0
+                for bit, (value, previous) in enumerate(zip(row, old)):
+                    if value != previous:
+                        mask |= 1 << bit
+            _write_varint(body, entity)
+            body.append(mask)
+            for bit, (_, field, _) in enumerate(FIELDS):
+                if mask & (1 << bit):
+                    body += field.pack(row[bit])
+            changed += 1
+
+        removed = [entity for entity in base if entity not in table]
+        for entity in removed:
+            _write_varint(body, entity)
+        return HEADER.pack(tick, baseline, changed, len(removed)) + body
+
+
+class SnapshotDecoder:
+    """
+    Receiver side: rebuilds each tick's table from its baseline. Ack the
+    returned tick so the sender can encode against it.
+    """
+
+    def __init__(self, history=SNAPSHOT_HISTORY):
+        self.history = history
+        self.tables = OrderedDict()  # decoded tables that may still be used as baselines
+
+    def decode(self, data):
+        """(tick, {entity id: quantized row}) of an encoded snapshot."""
+        tick, baseline, changed, removed = HEADER.unpack_from(data, 0)
+        if baseline:
+            if baseline not in self.tables:
+                raise KeyError(f"Snapshot {tick} needs unknown baseline {baseline}")
+            table = dict(self.tables[baseline])
+        else:
+            table = {}
+
+        offset = HEADER.size
+        for _ in range(changed):
+            entity, offset = _read_varint(data, offset)
+            mask = data[offset]
+            offset += 1
+            row = list(table.get(entity, (0,) * len(FIELDS)))
+            for bit, (_, field, _) in enumerate(FIELDS):
+                if mask & (1 << bit):
+                    row[bit] = field.unpack_from(data, offset)[0]
+                    offset += field.size
+            table[entity] = tuple(row)
+        for _ in range(removed):
+            entity, offset = _read_varint(data, offset)
+            table.pop(entity, None)
+
+        # The sender only moves its baseline forward, so older tables are dead
+        for old in [t for t in self.tables if t < baseline]:
+            del self.tables[old]
+        self.tables[tick] = table
+        while len(self.tables) > self.history:
+            self.tables.popitem(last=False)
+        return tick, table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure snapshot sizes and codec speed.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="stream a headless bot game through the codec")
+    bench.add_argument("--seconds", type=float, default=30.0, help="simulated play time")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--lag", type=int, default=2, help="ticks before an ack arrives")
+    args = parser.parse_args(argv)
+
+    import logger
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from controls import BotInput
+    from simulate import SIM_DT
+    from world import World
+    logger.set_enabled(False)
+
+    random.seed(args.seed)
+    world = World(lives=1000)
+    world.player.controller = BotInput(world.asteroids)
+    encoder = SnapshotEncoder(SCREEN_WIDTH, SCREEN_HEIGHT)
+    decoder = SnapshotDecoder()
+    acks = []
+    full_bytes = delta_bytes = entities = 0
+    encode_time = decode_time = 0.0
+    ticks = round(args.seconds / SIM_DT)
+
+    for tick in range(1, ticks + 1):
+        world.update(SIM_DT)
+        sprites = [*world.players, *world.asteroids, *world.shots, *world.powerups, *world.bombs]
+        start = time.perf_counter()
+        table = encoder.capture(tick, sprites)
+        data = encoder.encode(tick, acks[-args.lag] if len(acks) >= args.lag else None)
+        encode_time += time.perf_counter() - start
+        start = time.perf_counter()
+        decoded_tick, decoded = decoder.decode(data)
+        decode_time += time.perf_counter() - start
+        if decoded != table:
+            raise AssertionError(f"Tick {tick} did not round-trip")
+        acks.append(decoded_tick)
+        full_bytes += len(encoder.encode(tick))
+        delta_bytes += len(data)
+        entities += len(table)
+
+    print(json.dumps({
+        "ticks": ticks,
+        "mean_entities": round(entities / ticks, 1),
+        "full_bytes_per_tick": round(full_bytes / ticks, 1),
+        "delta_bytes_per_tick": round(delta_bytes / ticks, 1),
+        "delta_kbit_per_s": round(delta_bytes * 8 / 1000 / (ticks * SIM_DT), 1),
+        "encode_us": round(encode_time * 1e6 / ticks, 1),
+        "decode_us": round(decode_time * 1e6 / ticks, 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
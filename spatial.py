@@ -0,0 +1,262 @@
+"""
+Spatial index over the play field.
+
+Sprites interact where they are drawn: a sprite that drifts past an
+edge stays there, partly visible, until it is a whole radius out, and
+only then does wrap_screen() move it to just outside the opposite edge
+(see circleshape.py). Nothing is drawn or tested at the far side in the
+meantime, so distances here are plain center-to-center ones, exactly as
+CircleShape.collides_with() measures them.
+
+SpatialGrid buckets sprites into cells by their center taken modulo the
+field, so the few sprites in that margin share the edge cells across
+from them: a cell search then looks at slightly more sprites than it
+needs, never fewer. The index is updated incrementally as sprites move
+instead of being rebuilt every frame.
+
+SpatialGroup is a sprite group that keeps such an index of its members,
+so sprites created through `containers` are indexed automatically and
+dropped from it when killed.
+"""
+import math
+
+import pygame
+
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, SPATIAL_CELL_SIZE
+
+
+class SpatialGrid:
+    """
+    Bucket grid of circular sprites (anything with `position` and
+    `radius`), with cells wrapping around the field. Cells are stretched slightly so a whole number of them
+    tiles the field exactly.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.cols = max(1, round(width / cell_size))
+        self.rows = max(1, round(height / cell_size))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.cells = {}  # {(col, row): {sprite: None}} - dicts keep insertion order
+        self.where = {}  # {sprite: (col, row)}
+        self.max_radius = 0  # only grows; keeps queries conservative after removals
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, sprite):
+        return sprite in self.where
+
+    def __iter__(self):
+        return iter(self.where)
+
+    def _cell(self, x, y):
+        col = int((x % self.width) / self.cell_width)
+        row = int((y % self.height) / self.cell_height)
+        # x % width can round up to width itself for tiny negative x
+        return min(col, self.cols - 1), min(row, self.rows - 1)
+
+    def clear(self):
+        self.cells.clear()
+        self.where.clear()
+        self.max_radius = 0
+
+    def insert(self, sprite):
+        if sprite in self.where:
+            self.move(sprite)
+            return
+        cell = self._cell(sprite.position.x, sprite.position.y)
+        self.cells.setdefault(cell, {})[sprite] = None
+        self.where[sprite] = cell
+        self.max_radius = max(self.max_radius, sprite.radius)
+
+    def remove(self, sprite):
+        """Drop `sprite` from the index; unknown sprites are ignored."""
+        cell = self.where.pop(sprite, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        del bucket[sprite]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, sprite):
+        """Re-bucket `sprite` after its position changed. Returns True if its cell did."""
+        old = self.where[sprite]
+        new = self._cell(sprite.position.x, sprite.position.y)
+        if new == old:
+            return False
+        bucket = self.cells[old]
+        del bucket[sprite]
+        if not bucket:
+            del self.cells[old]
+        self.cells.setdefault(new, {})[sprite] = None
+        self.where[sprite] = new
+        return True
+
+    def reindex(self):
+        """Re-bucket every sprite whose cell changed; call once per frame after moving."""
+        moved = 0
+        for sprite in list(self.where):
+            if self.move(sprite):
+                moved += 1
+        return moved
+
+    def _cells_within(self, x, y, reach):
+        """Distinct cells a circle of `reach` around (x, y) can touch, wrapping
+        like _cell() does."""
+        x %= self.width
+        y %= self.height
+        first_col = math.floor((x - reach) / self.cell_width)
+        last_col = math.floor((x + reach) / self.cell_width)
+        first_row = math.floor((y - reach) / self.cell_height)
+        last_row = math.floor((y + reach) / self.cell_height)
+        if last_col - first_col + 1 >= self.cols:
+            cols = range(self.cols)
+        else:
+            cols = [col % self.cols for col in range(first_col, last_col + 1)]
+        if last_row - first_row + 1 >= self.rows:
+            rows = range(self.rows)
+        else:
+            rows = [row % self.rows for row in range(first_row, last_row + 1)]
+        return [(col, row) for col in cols for row in rows]
+
+    def distance(self, a, b):
+        """Center distance between two positions."""
+        return math.hypot(b.x - a.x, b.y - a.y)
+
+    def distance_sq(self, a, b):
+        """
+        Squared center distance, computed exactly as query_radius (and
+        the NumPy kernels in collisions.py) do, so orderings by it agree
+        bit for bit.
+        """
+        dx = b.x - a.x
+        dy = b.y - a.y
+        return dx * dx + dy * dy
+
+    def query_radius(self, position, radius):
+        """
+        Sprites whose circle touches the circle at `position` with `radius`
+        (center distance <= radius + sprite.radius).
+        """
+        x, y = position.x, position.y
+        found = []
+        for cell in self._cells_within(x, y, radius + self.max_radius):
+            for sprite in self.cells.get(cell, ()):
+                dx = sprite.position.x - x
+                dy = sprite.position.y - y
+                limit = radius + sprite.radius
+                if dx * dx + dy * dy <= limit * limit:
+                    found.append(sprite)
+        return found
+
+    def nearest(self, position, max_distance=math.inf, where=None):
+        """
+        (sprite, center distance) of the closest sprite to `position`, or
+        (None, inf). Searches rings of cells outwards and stops once no
+        unvisited cell can hold anything closer. `where` filters candidates.
+        """
+        if not self.where:
+            return None, math.inf
+        x, y = position.x, position.y
+        col, row = self._cell(x, y)
+        best, best_distance = None, max_distance
+        step = min(self.cell_width, self.cell_height)
+        rings = max(self.cols, self.rows) // 2 + 1
+        visited = set()
+
+        for ring in range(rings + 1):
+            # Anything in ring r or beyond is at least (r - 1) cells away
+            if best is not None and best_distance <= (ring - 1) * step:
+                break
+            if (ring - 1) * step > max_distance:
+                break
+            for dc in range(-ring, ring + 1):
+                for dr in range(-ring, ring + 1):
+                    if max(abs(dc), abs(dr)) != ring:
+                        continue
+                    cell = ((col + dc) % self.cols, (row + dr) % self.rows)
+                    if cell in visited:
+                        continue
+                    visited.add(cell)
+                    for sprite in self.cells.get(cell, ()):
+                        if where is not None and not where(sprite):
+                            continue
+                        distance = self.distance(position, sprite.position)
+                        if distance < best_distance:
+                            best, best_distance = sprite, distance
+        if best is None:
+            return None, math.inf
+        return best, best_distance
+
+    def raycast(self, origin, direction, length, where=None):
+        """
+        (sprite, distance) of the first circle hit by the segment from
+        `origin` along unit vector `direction` for `length`, or (None, length).
+        Only cells along the segment are searched.
+        """
+        ox, oy = origin.x, origin.y
+        dx, dy = direction.x, direction.y
+        step = min(self.cell_width, self.cell_height) / 2
+        reach = self.max_radius + step  # covers circles between samples
+
+        cells = {}
+        distance = 0.0
+        while True:
+            for cell in self._cells_within(ox + dx * distance, oy + dy * distance, reach):
+                cells[cell] = None
+            if distance >= length:
+                break
+            distance = min(length, distance + step)
+
+        best, best_t = None, length
+        for cell in cells:
+            for sprite in self.cells.get(cell, ()):
+                if where is not None and not where(sprite):
+                    continue
+                cx = sprite.position.x - ox
+                cy = sprite.position.y - oy
+                along = cx * dx + cy * dy
+                offset_sq = cx * cx + cy * cy - sprite.radius * sprite.radius
+                if offset_sq <= 0:
+                    t = 0.0  # ray starts inside the circle
+                else:
+                    disc = along * along - offset_sq
+                    if along < 0 or disc < 0:
+                        continue
+                    t = along - math.sqrt(disc)
+                if t < best_t:
+                    best, best_t = sprite, t
+        return best, best_t
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """A sprite group that maintains a SpatialGrid of its members."""
+
+    def __init__(self, *sprites, cell_size=SPATIAL_CELL_SIZE):
+        self.index = SpatialGrid(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.index.insert(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.index.remove(sprite)
+
+    def reindex(self):
+        """Catch the index up with this frame's movement."""
+        return self.index.reindex()
+
+    def query_radius(self, position, radius):
+        return self.index.query_radius(position, radius)
+
+    def nearest(self, position, max_distance=math.inf, where=None):
+        return self.index.nearest(position, max_distance, where)
+
+    def raycast(self, origin, direction, length, where=None):
+        return self.index.raycast(origin, direction, length, where)
@@ -0,0 +1,78 @@
+"""
+Cache of pre-rendered sprite visuals ("stamps").
+Many entities look identical, or cycle through a handful of looks, so
+their visuals are rendered once onto a transparent surface keyed by
+(type, color, size, animation phase bucket, ...) and then drawn with a
+single blit. Continuous animations are quantized into STAMP_PHASE_BUCKETS
+steps so the number of distinct stamps stays small.
+
+Fonts are cached the same way: loading one reads and parses the font
+file, far too slow to repeat every frame. So is text that never changes
+(menu lines, HUD labels); text() renders each string once.
+"""
+import math
+
+import pygame
+
+from constants import STAMP_PHASE_BUCKETS
+
+
+def phase_bucket(phase, period=2 * math.pi, buckets=STAMP_PHASE_BUCKETS):
+    """Quantize a cyclic phase into one of `buckets` steps."""
+    return int((phase % period) / period * buckets) % buckets
+
+
+def bucket_phase(bucket, period=2 * math.pi, buckets=STAMP_PHASE_BUCKETS):
+    """Phase at the middle of a bucket, for rendering that bucket's stamp."""
+    return (bucket + 0.5) / buckets * period
+
+
+class StampCache:
+    """Surfaces by key, rendered on first use by the caller's `render()`."""
+
+    def __init__(self):
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def get(self, key, render):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = render()
+            self.misses += 1
+        else:
+            self.hits += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# Shared by every sprite class
+stamps = StampCache()
+
+
+_fonts = {}
+
+
+def font(size):
+    """The default font at `size`, loaded on first use."""
+    loaded = _fonts.get(size)
+    if loaded is None:
+        loaded = _fonts[size] = pygame.font.Font(None, size)
+    return loaded
+
+
+_texts = {}
+
+
+def text(size, string, color):
+    """`string` rendered in the default font at `size`, cached; for fixed text only."""
+    key = (size, string, color)
+    rendered = _texts.get(key)
+    if rendered is None:
+        rendered = _texts[key] = font(size).render(string, True, color)
+    return rendered
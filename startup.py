@@ -0,0 +1,54 @@
+"""
+Startup timing and background module preloading.
+
+The menu needs only pygame, fonts and the starfield. Everything the game
+itself needs (world and entities, collisions, checkpoints, capture) is
+imported on first use; preload() starts importing it on a background
+thread once the first frame is up, so pressing ENTER usually finds it
+already loaded.
+
+StartupTimer records how long each phase took up to the first frame:
+
+    ASTEROIDS_STARTUP_TIMES=1 python main.py
+"""
+import importlib
+import threading
+import time
+
+# Interpreter start as near as we can see it: the first import of this module
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """Durations of consecutive named startup phases."""
+
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self.last = start
+        self.phases = {}
+
+    def mark(self, phase):
+        """Close the phase running since the previous mark as `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    def report(self):
+        """{phase: ms, ..., "total": ms} rounded for display."""
+        report = {phase: round(seconds * 1000, 2) for phase, seconds in self.phases.items()}
+        report["total"] = round((self.last - self.start) * 1000, 2)
+        return report
+
+    def __str__(self):
+        return ", ".join(f"{phase} {ms:.1f}ms" for phase, ms in self.report().items())
+
+
+def preload(*modules):
+    """Import `modules` on a daemon thread; returns the thread."""
+    def run():
+        for name in modules:
+            importlib.import_module(name)
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
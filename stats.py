@@ -0,0 +1,165 @@
+"""
+Incremental game statistics.
+Consumes gameplay events as they happen and keeps counters, rolling
+rates and histograms up to date in constant time per event, so the HUD
+and end-of-session reports never need to reparse the event log.
+"""
+import bisect
+import json
+
+# Event kinds recorded by World
+EVENT_ASTEROID_SPLIT = "asteroid_split"
+EVENT_ASTEROID_DESTROYED = "asteroid_destroyed"
+EVENT_POWERUP_COLLECTED = "powerup_collected"
+EVENT_BOMB_DETONATED = "bomb_detonated"
+EVENT_PLAYER_DEATH = "player_death"
+
+# Points per kill source
+KILL_SCORES = {
+    "shot": 10,
+    "bomb": 15,  # Bonus for bomb kills
+    "shield": 5,
+    "beam": 10,
+}
+POWERUP_SCORE = 25  # Bonus for collecting power-ups
+
+
+class RollingCounter:
+    """
+    Sum of values added over the last `window` seconds.
+    Time is split into `window / resolution` buckets in a ring buffer.
+    """
+
+    def __init__(self, window=10.0, resolution=1.0):
+        self.resolution = resolution
+        self.buckets = [0] * max(1, int(round(window / resolution)))
+        self.index = 0
+        self.elapsed = 0.0
+        self.total = 0
+
+    def add(self, value=1):
+        self.buckets[self.index] += value
+        self.total += value
+
+    def tick(self, dt):
+        """Advance time, expiring buckets that fell out of the window."""
+        self.elapsed += dt
+        while self.elapsed >= self.resolution:
+            self.elapsed -= self.resolution
+            self.index = (self.index + 1) % len(self.buckets)
+            self.total -= self.buckets[self.index]
+            self.buckets[self.index] = 0
+
+    @property
+    def window(self):
+        return len(self.buckets) * self.resolution
+
+    @property
+    def rate(self):
+        """Average per second over the window."""
+        return self.total / self.window
+
+
+class Histogram:
+    """Counts values into fixed buckets given by their upper edges."""
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)  # last bucket is overflow
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.edges, value)] += 1
+
+    def to_dict(self):
+        labels = [f"<={edge}" for edge in self.edges] + [f">{self.edges[-1]}"]
+        return dict(zip(labels, self.counts))
+
+
+class GameStats:
+    """Running statistics for one round of play."""
+
+    def __init__(self):
+        self.time = 0.0
+        self.score = 0
+        self.kills = 0
+        self.kills_by_source = dict.fromkeys(KILL_SCORES, 0)
+        self.splits = 0
+        self.powerups = {}
+        self.bombs = 0
+        self.deaths = 0
+        self.streak = 0  # kills since the last death
+        self.best_streak = 0
+        self.life_started = 0.0
+
+        self.recent_kills = RollingCounter(window=10.0)
+        self.kill_radius = Histogram([20, 40, 60])
+        self.bomb_hits = Histogram([0, 1, 2, 4, 8])
+        self.life_seconds = Histogram([10, 30, 60, 120, 300])
+
+        self._handlers = {
+            EVENT_ASTEROID_SPLIT: self._on_split,
+            EVENT_ASTEROID_DESTROYED: self._on_destroyed,
+            EVENT_POWERUP_COLLECTED: self._on_powerup,
+            EVENT_BOMB_DETONATED: self._on_bomb,
+            EVENT_PLAYER_DEATH: self._on_death,
+        }
+
+    def tick(self, dt):
+        """Advance the stats clock by one frame."""
+        self.time += dt
+        self.recent_kills.tick(dt)
+
+    def record(self, kind, **details):
+        """Consume one gameplay event; unknown kinds are ignored."""
+        handler = self._handlers.get(kind)
+        if handler:
+            handler(**details)
+
+    def _on_split(self, radius=0, **_):
+        self.splits += 1
+
+    def _on_destroyed(self, source="shot", radius=0, **_):
+        self.kills += 1
+        self.kills_by_source[source] = self.kills_by_source.get(source, 0) + 1
+        self.score += KILL_SCORES.get(source, 0)
+        self.streak += 1
+        self.best_streak = max(self.best_streak, self.streak)
+        self.recent_kills.add()
+        self.kill_radius.add(radius)
+
+    def _on_powerup(self, name="", **_):
+        self.powerups[name] = self.powerups.get(name, 0) + 1
+        self.score += POWERUP_SCORE
+
+    def _on_bomb(self, hits=0, **_):
+        self.bombs += 1
+        self.bomb_hits.add(hits)
+
+    def _on_death(self, **_):
+        self.deaths += 1
+        self.streak = 0
+        self.life_seconds.add(self.time - self.life_started)
+        self.life_started = self.time
+
+    def to_dict(self):
+        return {
+            "time_s": round(self.time, 3),
+            "score": self.score,
+            "kills": self.kills,
+            "kills_by_source": dict(self.kills_by_source),
+            "splits": self.splits,
+            "powerups": dict(self.powerups),
+            "bombs": self.bombs,
+            "deaths": self.deaths,
+            "best_streak": self.best_streak,
+            "kills_per_s_recent": round(self.recent_kills.rate, 3),
+            "kill_radius": self.kill_radius.to_dict(),
+            "bomb_hits": self.bomb_hits.to_dict(),
+            "life_seconds": self.life_seconds.to_dict(),
+        }
+
+    def dump(self, path):
+        """Write the session summary as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,70 @@
+"""
+Collision passes agree with what is drawn at the screen edges.
+
+    python -m unittest discover tests
+"""
+import unittest
+from unittest import mock
+
+import pygame
+
+import collisions
+import constants
+from circleshape import CircleShape
+from constants import PLAYER_RADIUS, SCREEN_WIDTH, SHOT_RADIUS
+from player import Player
+from spatial import SpatialGroup
+
+
+def _field(asteroid_x, radius=40):
+    asteroid = CircleShape(asteroid_x, 300, radius)
+    return asteroid, SpatialGroup(asteroid)
+
+
+def _both_passes():
+    """Patches selecting the serial pass, then the NumPy kernel."""
+    yield "serial", mock.patch.object(constants, "COLLISION_VECTORIZED", False)
+    if collisions.np is not None:
+        yield "kernel", mock.patch.object(constants, "COLLISION_VECTOR_MIN_PAIRS", 0)
+
+
+class EdgeTest(unittest.TestCase):
+
+    def test_shot_misses_asteroid_past_opposite_edge(self):
+        # Centred a radius past the right edge: not drawn, and not yet
+        # wrapped by wrap_screen(), so nothing at the left edge can hit it
+        asteroid, asteroids = _field(SCREEN_WIDTH + 40)
+        shot = CircleShape(2, 300, SHOT_RADIUS)
+        for name, patch in _both_passes():
+            with self.subTest(name), patch:
+                self.assertEqual(collisions.shot_hits([shot], asteroids), [])
+
+    def test_shot_hits_asteroid_overhanging_its_own_edge(self):
+        asteroid, asteroids = _field(SCREEN_WIDTH + 30)
+        shot = CircleShape(SCREEN_WIDTH - 5, 300, SHOT_RADIUS)
+        for name, patch in _both_passes():
+            with self.subTest(name), patch:
+                self.assertEqual(collisions.shot_hits([shot], asteroids), [(shot, asteroid)])
+
+    def test_ship_and_shots_agree_at_the_edge(self):
+        # The ship pass tests the triangle directly; the shot pass goes
+        # through the index. Both must see the same asteroid positions.
+        asteroid, asteroids = _field(SCREEN_WIDTH + 40)
+        ship = Player(PLAYER_RADIUS, 300)
+        self.assertEqual(collisions.ship_hits(ship, asteroids), [])
+        ship.position.x = SCREEN_WIDTH - 5
+        self.assertEqual(collisions.ship_hits(ship, asteroids), [asteroid])
+        shot = CircleShape(ship.position.x, 300, SHOT_RADIUS)
+        self.assertEqual(collisions.shot_hits([shot], asteroids), [(shot, asteroid)])
+
+    def test_index_queries_do_not_reach_across_the_edge(self):
+        asteroid, asteroids = _field(SCREEN_WIDTH + 40)
+        origin = pygame.Vector2(2, 300)
+        self.assertEqual(asteroids.query_radius(origin, SHOT_RADIUS), [])
+        self.assertEqual(asteroids.nearest(origin, 100), (None, float("inf")))
+        self.assertIsNone(asteroids.raycast(origin, pygame.Vector2(-1, 0), 200)[0])
+        self.assertIs(asteroids.nearest(origin)[0], asteroid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Cache warm-up on the menu screen.
+
+Much of what gameplay draws is rendered once and cached: sprite stamps,
+particle glows, text. Left to fill on first use, those caches make the
+first seconds of a game (first shots, first explosions, first power-up)
+stutter while steady-state frames do not. The menu leaves most of each
+frame idle, so Warmup renders them ahead of time, one small step at a
+time, as an idle-priority job on the frame scheduler (see scheduler.py).
+
+A task is a generator that does one step of work per next(); menu_tasks()
+lists the game's. Caches are keyed exactly as the sprites key them, so
+warm-up only moves work earlier and never changes what is drawn.
+"""
+import string
+import time
+
+import pygame
+
+from constants import (
+    BOMB_FUSE_STEPS,
+    BOMB_FUSE_TIME,
+    EXPLOSION_COLORS,
+    POWERUP_CONFIGS,
+    SHIELD_RING_RADIUS,
+    SHOT_RADIUS,
+    STAMP_PHASE_BUCKETS,
+    WEAPON_CONFIGS,
+)
+from logger import log_event
+from stamps import bucket_phase, font, text
+
+# Text drawn by main() that never changes
+MENU_TEXT = {
+    72: [("ASTEROIDS", (100, 200, 255)), ("GAME OVER", (255, 80, 80))],
+    36: [("Enhanced Edition", (150, 150, 150)), ("Press ENTER to Start", "white"),
+         ("Press R to Restart", "white"), ("Lives:", "white")],
+}
+GLYPHS = string.ascii_letters + string.digits + string.punctuation + " •"
+
+
+class Warmup:
+    """Runs warm-up tasks in order, a few steps per call to run()."""
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)  # [(name, generator)]
+        self.times = {}  # {name: seconds spent}
+        self.steps = 0
+
+    @property
+    def done(self):
+        return not self.tasks
+
+    def run(self, budget):
+        """Step tasks until `budget` seconds have passed (at least one step)."""
+        start = now = time.perf_counter()
+        deadline = start + budget
+        while self.tasks:
+            name, task = self.tasks[0]
+            try:
+                next(task)
+            except StopIteration:
+                self.tasks.pop(0)
+            self.steps += 1
+            last, now = now, time.perf_counter()
+            self.times[name] = self.times.get(name, 0.0) + now - last
+            if now >= deadline:
+                break
+        return now - start
+
+    def job(self):
+        """The whole warm-up as one scheduler job: a step per next()."""
+        while self.tasks:
+            self.run(0)
+            yield
+        log_event("warmup", steps=self.steps,
+                  **{f"{task}_ms": ms for task, ms in self.report().items()})
+
+    def finish(self):
+        """Run whatever is left, however long it takes."""
+        while self.tasks:
+            self.run(float("inf"))
+
+    def report(self):
+        """{task: ms} spent so far, rounded for display."""
+        return {name: round(seconds * 1000, 2) for name, seconds in self.times.items()}
+
+
+def menu_tasks(background):
+    """Everything worth warming while the menu is up, cheapest to miss last."""
+    return [
+        ("starfield", _starfield(background)),
+        ("text", _text()),
+        ("particles", _particle_glows()),
+        ("shots", _shot_stamps()),
+        ("bombs", _bomb_stamps()),
+        ("powerups", _powerup_stamps()),
+        ("shield", _shield_glows()),
+    ]
+
+
+def _starfield(background):
+    """The nebula spots baked into the starfield's gradient layer."""
+    while background.bake_step():
+        yield
+
+
+def _text():
+    """Fixed menu and HUD text, then every glyph at each size the game uses."""
+    for size, lines in MENU_TEXT.items():
+        for line, color in lines:
+            text(size, line, color)
+            yield
+    for size in (24, 36, 72):
+        font(size).render(GLYPHS, True, "white")
+        yield
+
+
+def _particle_glows():
+    """Halo of every particle size and fade step an explosion can reach."""
+    from explosion import glow_stamp
+    for color in EXPLOSION_COLORS:
+        # Smoke (the last color) starts larger than the sparks
+        largest = 7 if color == EXPLOSION_COLORS[-1] else 5
+        for size in range(1, largest + 1):
+            for alpha in range(int(255 * 0.3) + 1):
+                glow_stamp(color, size, alpha)
+                yield
+
+
+def _detached(sprite):
+    """A sprite made only for its looks, out of whatever groups it joined."""
+    sprite.kill()
+    return sprite
+
+
+def _shot_stamps():
+    from shot import Shot
+    for config in WEAPON_CONFIGS.values():
+        if config.get("beam"):
+            continue  # drawn live; missiles share the shot stamp under their trail
+        shot = _detached(Shot(0, 0, config.get("size", SHOT_RADIUS), config["color"], 0))
+        shot.stamp()
+        yield
+
+
+def _bomb_stamps():
+    from bomb import Bomb
+    bomb = _detached(Bomb(0, 0, pygame.Vector2()))
+    # Several samples per fuse step so both sides of the warning flash are hit
+    samples = BOMB_FUSE_STEPS * 4
+    for i in range(samples):
+        bomb.fuse_timer = (i + 0.5) / samples * BOMB_FUSE_TIME
+        for blink_phase in (0, 1):
+            bomb.blink_phase = blink_phase
+            bomb.stamp()
+        yield
+
+
+def _powerup_stamps():
+    from powerup import PowerUp
+    for powerup_type in POWERUP_CONFIGS:
+        powerup = _detached(PowerUp(0, 0, powerup_type))
+        for bucket in range(STAMP_PHASE_BUCKETS):
+            powerup.glow_phase = bucket_phase(bucket)
+            for lifetime in (15.0, 0.1):  # steady, then blinking out
+                powerup.lifetime = lifetime
+                powerup.stamp()
+            yield
+
+
+def _shield_glows():
+    from player import Player
+    # The shield pulses between 0.6 and 1.0 of its full radius
+    for radius in range(int(SHIELD_RING_RADIUS * 0.6), SHIELD_RING_RADIUS + 1):
+        Player.shield_glow(radius)
+        yield
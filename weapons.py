@@ -8,10 +8,12 @@ from constants import (
     WEAPON_SPREAD,
     WEAPON_RAPID,
     WEAPON_LASER,
+    WEAPON_HOMING,
     WEAPON_CONFIGS,
     SHOT_RADIUS,
 )
-from shot import Shot
+from shot import Shot, Missile
+from beam import Beam
 
 
 class Weapon:
@@ -21,6 +23,19 @@ class Weapon:
         self.weapon_type = weapon_type
         self.config = WEAPON_CONFIGS[weapon_type]
         self.cooldown_timer = 0
+        self.beam = None  # live Beam sprite for beam weapons
+    
+    def __getstate__(self):
+        # Config comes from WEAPON_CONFIGS and the beam sprite is saved with
+        # the world; don't copy either into checkpoints
+        state = self.__dict__.copy()
+        del state["config"]
+        state["beam"] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.config = WEAPON_CONFIGS[self.weapon_type]
     
     @property
     def name(self):
@@ -73,6 +88,10 @@ class Weapon:
         # Calculate base direction
         forward = pygame.Vector2(0, 1).rotate(rotation)
         
+        if self.config.get("beam"):
+            self._hold_beam(position, forward)
+            return shots
+        
         # Create shots based on weapon type
         if self.shot_count == 1:
             # Single shot
@@ -91,10 +110,22 @@ class Weapon:
         
         return shots
     
+    def _hold_beam(self, position, direction):
+        """Keep this weapon's beam on, creating it if it has lapsed."""
+        if self.beam is not None and self.beam.alive():
+            self.beam.aim(position, direction)
+        else:
+            self.beam = Beam(position, direction, self.config["range"],
+                             self.color, self.damage, self.config.get("size", 2))
+    
     def _create_shot(self, position, direction):
         """Create a single shot projectile."""
         size = self.config.get("size", SHOT_RADIUS)
-        shot = Shot(position.x, position.y, size, self.color, self.damage)
+        if self.config.get("homing"):
+            shot = Missile(position.x, position.y, size, self.color, self.damage,
+                           self.config["turn_rate"], self.config["lock_range"])
+        else:
+            shot = Shot(position.x, position.y, size, self.color, self.damage)
         shot.velocity = direction * self.shot_speed
         return shot
 
@@ -110,6 +141,7 @@ class WeaponManager:
             WEAPON_SPREAD: Weapon(WEAPON_SPREAD),
             WEAPON_RAPID: Weapon(WEAPON_RAPID),
             WEAPON_LASER: Weapon(WEAPON_LASER),
+            WEAPON_HOMING: Weapon(WEAPON_HOMING),
         }
         self.temp_weapon = None  # Temporary weapon from power-up
         self.temp_weapon_timer = 0
@@ -0,0 +1,280 @@
+"""
+Game world shared by the interactive loop and headless simulations.
+Owns the sprite groups, the player, the asteroid spawner, score and lives,
+and applies the gameplay rules (bombs, collisions, pickups) each frame.
+"""
+import pygame
+
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BOMB_EXPLOSION_RADIUS, ASTEROID_MIN_RADIUS,
+)
+from logger import log_event
+from stats import (
+    GameStats,
+    EVENT_ASTEROID_SPLIT,
+    EVENT_ASTEROID_DESTROYED,
+    EVENT_POWERUP_COLLECTED,
+    EVENT_BOMB_DETONATED,
+    EVENT_PLAYER_DEATH,
+)
+from player import Player
+from asteroid import Asteroid, AsteroidGroup
+from asteroidfield import AsteroidField
+from shot import Shot, Missile
+from explosion import Explosion, create_explosion
+from powerup import PowerUp, maybe_spawn_powerup
+from bomb import Bomb
+from beam import Beam
+import collisions
+
+
+class World:
+    """
+    A single round of play, from spawn to game over.
+    Creating a World wires the entity classes to its sprite groups; when
+    several worlds share a process, call activate() before stepping one.
+    With `populate=False` it starts empty (checkpoint restore fills it).
+    Extra ships join with add_player(); they share score and lives.
+    """
+
+    def __init__(self, lives=3, controller=None, populate=True):
+        # Create sprite groups
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.LayeredUpdates()  # iterates in `_layer` order
+        self.asteroids = AsteroidGroup()  # spatial index plus running mass
+        self.shots = pygame.sprite.Group()
+        self.explosions = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.bombs = pygame.sprite.Group()
+        self.beams = pygame.sprite.Group()
+        self.activate()
+
+        self.hits = []  # (asteroid, damage, source) queued for _apply_hits
+        self.collider = collisions.make_collider()  # None: no parallel shot pass
+        self.render_stats = {
+            "drawn": 0, "culled": 0, "stamped": 0, "blit_batches": 0,
+            "particles_drawn": 0, "particles_culled": 0,
+        }
+
+        self.stats = GameStats()
+        self.lives = lives
+        self.game_over = False
+
+        # Create game objects
+        self.players = []
+        self.player = None  # the first (local) ship
+        self.asteroid_field = None
+        if populate:
+            self.add_player(controller)
+            self.asteroid_field = AsteroidField()
+
+    def activate(self):
+        """Point the entity classes' static containers at this world's groups."""
+        Player.containers = (self.updatable, self.drawable)
+        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
+        AsteroidField.containers = (self.updatable,)
+        AsteroidField.asteroids = self.asteroids
+        Shot.containers = (self.shots, self.updatable, self.drawable)
+        Missile.targets = self.asteroids
+        Explosion.containers = (self.explosions, self.updatable, self.drawable)
+        PowerUp.containers = (self.powerups, self.updatable, self.drawable)
+        Bomb.containers = (self.bombs, self.updatable, self.drawable)
+        Beam.containers = (self.beams, self.updatable, self.drawable)
+
+    def add_player(self, controller=None):
+        """Spawn a ship at the center driven by `controller`."""
+        self.activate()
+        player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, controller)
+        self.players.append(player)
+        if self.player is None:
+            self.player = player
+        return player
+
+    def remove_player(self, player):
+        """Take a ship out of play (e.g. its client disconnected)."""
+        player.kill()
+        self.players.remove(player)
+        if self.player is player:
+            self.player = self.players[0] if self.players else None
+
+    @property
+    def score(self):
+        return self.stats.score
+
+    def update(self, dt):
+        """Advance one frame: move everything, then resolve interactions."""
+        self.stats.tick(dt)
+        self.updatable.update(dt)
+        self.asteroids.reindex()
+
+        self._resolve_bombs()
+        self._resolve_player_asteroids()
+        self._resolve_shot_asteroids()
+        self._resolve_beams(dt)
+        self._apply_hits()
+        self._resolve_player_powerups()
+
+    def draw(self, screen):
+        """
+        Draw all objects that can appear on screen, back to front by layer
+        (see LAYER_* in constants). Sprites whose drawn extent lies entirely
+        outside the screen are skipped; explosions cull their own particles.
+        Consecutive sprites that provide a stamp are blitted in one batch.
+        Counts land in `render_stats`.
+        """
+        width, height = screen.get_size()
+        drawn = culled = stamped = batches = particles_drawn = particles_culled = 0
+        batch = []
+        for obj in self.drawable:
+            extent = obj.draw_extent()
+            if extent is not None:
+                x, y = obj.position
+                if x < -extent or y < -extent or x > width + extent or y > height + extent:
+                    culled += 1
+                    continue
+            drawn += 1
+
+            stamp = obj.stamp()
+            if stamp is not None:
+                batch.append(stamp)
+                stamped += 1
+                continue
+
+            # Flush pending stamps first so draw order stays exact
+            if batch:
+                screen.blits(batch, doreturn=False)
+                batches += 1
+                batch = []
+            obj.draw(screen)
+            if isinstance(obj, Explosion):
+                particles_drawn += obj.particles_drawn
+                particles_culled += obj.particles_culled
+        if batch:
+            screen.blits(batch, doreturn=False)
+            batches += 1
+
+        stats = self.render_stats
+        stats["drawn"] = drawn
+        stats["culled"] = culled
+        stats["stamped"] = stamped
+        stats["blit_batches"] = batches
+        stats["particles_drawn"] = particles_drawn
+        stats["particles_culled"] = particles_culled
+
+    def _record(self, kind, message=None, **details):
+        """Feed an event to the stats engine, and to the event log if it has a message."""
+        self.stats.record(kind, **details)
+        if message:
+            log_event(message, kind=kind, **details)
+
+    def _destroy_asteroid(self, asteroid, source, message=None):
+        """Split an asteroid with an explosion. Returns (x, y, radius)."""
+        self._record(EVENT_ASTEROID_DESTROYED, message, source=source, radius=asteroid.radius)
+        pos_x, pos_y, radius = asteroid.split()
+        if radius > ASTEROID_MIN_RADIUS:
+            self._record(EVENT_ASTEROID_SPLIT, radius=radius)
+
+        explosion = create_explosion(pos_x, pos_y, radius)
+        self.explosions.add(explosion)
+        return pos_x, pos_y, radius
+
+    def _resolve_bombs(self):
+        """
+        Detonate bombs whose fuse has run out.
+        Every bomb going off this frame finds its asteroids before any of
+        them destroys anything. Fragments split off by a blast are
+        therefore never caught by a blast of the same frame, and an asteroid
+        inside several blasts is destroyed (and credited) once, by the first
+        bomb in group order. Each blast takes its asteroids nearest first.
+        """
+        detonating = [bomb for bomb in self.bombs if bomb.exploded]
+        if not detonating:
+            return
+
+        for bomb, caught in zip(detonating, collisions.blast_hits(detonating, self.asteroids)):
+            # Create explosion
+            explosion = create_explosion(bomb.position.x, bomb.position.y,
+                                         BOMB_EXPLOSION_RADIUS // 2)
+            self.explosions.add(explosion)
+
+            # Destroy asteroids in blast radius
+            hits = 0
+            for asteroid in caught:
+                if asteroid.alive():  # not already taken by an earlier bomb
+                    self._destroy_asteroid(asteroid, "bomb")
+                    hits += 1
+
+            self._record(EVENT_BOMB_DETONATED, "Bomb exploded!", hits=hits)
+            bomb.kill()
+
+    def _resolve_player_asteroids(self):
+        """Shield kills or player deaths from asteroid contact."""
+        for player in self.players:
+            for asteroid in collisions.ship_hits(player, self.asteroids):
+                if not asteroid.alive():
+                    continue
+                if player.is_shielded():
+                    # Shield destroys asteroids on contact
+                    self._destroy_asteroid(asteroid, "shield", "Shield destroyed asteroid!")
+                elif player.invulnerable_timer <= 0:
+                    self.lives -= 1
+                    self._record(EVENT_PLAYER_DEATH, "Player hit!", lives=self.lives)
+
+                    # Create explosion at player
+                    explosion = create_explosion(player.position.x, player.position.y, 20)
+                    self.explosions.add(explosion)
+
+                    if self.lives <= 0:
+                        self.game_over = True
+                    else:
+                        player.reset(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+
+    def _resolve_shot_asteroids(self):
+        """
+        Queue a hit for each shot touching an asteroid; the nearest one
+        takes it and the shot is spent. Large passes go to the parallel
+        collider when COLLISION_WORKERS enables it.
+        """
+        collider = self.collider
+        if collider is not None and collider.worthwhile(self.shots, self.asteroids):
+            pairs = collider.shot_hits(self.shots, self.asteroids)
+        else:
+            pairs = collisions.shot_hits(self.shots, self.asteroids)
+        for shot, asteroid in pairs:
+            self.hits.append((asteroid, shot.damage, "shot"))
+            shot.kill()
+
+    def _resolve_beams(self, dt):
+        """Cast each beam once; it stops at, and burns, the first asteroid in its path."""
+        for beam in self.beams:
+            asteroid, beam.length = self.asteroids.raycast(beam.position, beam.direction, beam.range)
+            if asteroid is not None:
+                self.hits.append((asteroid, beam.damage * dt, "beam"))
+
+    def _apply_hits(self):
+        """
+        Apply this frame's queued damage in one pass. An asteroid splits
+        at most once per frame, credited to the hit that wore it down;
+        later hits on it are wasted, and its fragments take none until
+        next frame.
+        """
+        for asteroid, damage, source in self.hits:
+            if not asteroid.alive():
+                continue
+            asteroid.health -= damage
+            if asteroid.health <= 0:
+                pos_x, pos_y, radius = self._destroy_asteroid(asteroid, source, "Asteroid hit!")
+
+                # Maybe spawn power-up
+                powerup = maybe_spawn_powerup(pos_x, pos_y)
+                if powerup:
+                    self.powerups.add(powerup)
+        self.hits.clear()
+
+    def _resolve_player_powerups(self):
+        """Collect power-ups the ships touch; the first ship to touch one gets it."""
+        for powerup, player in collisions.pickups(self.powerups, self.players):
+            self._record(EVENT_POWERUP_COLLECTED, f"Collected {powerup.name} power-up!",
+                         name=powerup.name)
+            player.apply_powerup(powerup)
+            powerup.kill()